@@ -0,0 +1,9 @@
+"""
+Pytest configuration for the component tests
+"""
+
+import sys
+from pathlib import Path
+
+# Make the core package importable when the tests are collected by pytest
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -5,38 +5,176 @@ Run All Component Tests
 
 import sys
 import os
+import compileall
+import importlib.util
+import selectors
+import shutil
 import subprocess
 from pathlib import Path
+from typing import List, Tuple
 import time
 
-
-def run_test(test_file: Path, description: str) -> bool:
-    """Run a single test file and return success status"""
+TEST_DIR = Path(__file__).resolve().parent
+PYTHON = os.fsencode(sys.executable)
+
+# Independent component tests, resolved once at import time
+TESTS = tuple(
+    (TEST_DIR / name, description)
+    for name, description in (
+        ("test_settings.py", "Settings Manager"),
+        ("test_health_checker.py", "Health Checker"),
+        ("test_status_tracker.py", "Status Tracker"),
+        ("test_notifications.py", "Notification System"),
+    )
+)
+TEST_TIMEOUT = 60  # seconds per test
+SYSTEM_TRAY_TEST = (TEST_DIR / "test_system_tray.py", "System Tray Integration")
+
+# (module, description) pairs checked before running the tests
+DEPENDENCIES = (
+    ("gi", "PyGObject (for GTK)"),
+    ("requests", "Requests (for webhooks)"),
+)
+SYSTEM_COMMANDS = (
+    ("notify-send", "Desktop notifications (Linux)"),
+    ("ping", "Network ping"),
+)
+
+
+def prewarm_bytecode():
+    """Compile core and test modules once so concurrent test interpreters
+    load cached bytecode instead of each compiling the same sources"""
+    for directory in (TEST_DIR.parent / "core", TEST_DIR):
+        compileall.compile_dir(directory, maxlevels=0, quiet=1)
+
+
+def _test_env() -> dict:
+    """Child environment with the sato root on PYTHONPATH so the test
+    scripts can import the core package without editing sys.path"""
+    env = dict(os.environ)
+    paths = [str(TEST_DIR.parent)]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+TEST_ENV = _test_env()
+
+
+def report_test(description: str, success: bool, output: str) -> bool:
+    """Print a finished test's output as a single block"""
     print(f"\n{'='*60}")
-    print(f"🧪 Running {description}")
+    print(f"🧪 {description}")
     print(f"{'='*60}")
+    print(output.rstrip())
 
-    try:
-        # Run the test
-        result = subprocess.run(
-            [sys.executable, str(test_file)],
-            capture_output=False,
-            text=True,
-            timeout=60,
+    if success:
+        print(f"✅ {description} - PASSED")
+    else:
+        print(f"❌ {description} - FAILED")
+    return success
+
+
+def _launch_test(test_file: Path) -> subprocess.Popen:
+    """Start a test interpreter with stdout and stderr merged into one pipe"""
+    # close_fds=False and no preexec/cwd hooks keep CPython on its
+    # posix_spawn fast path; the pipe fds are already non-inheritable
+    return subprocess.Popen(
+        [PYTHON, os.fsencode(test_file)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        close_fds=False,
+        env=TEST_ENV,
+    )
+
+
+def run_tests(tests) -> List[Tuple[str, bool]]:
+    """Run test files concurrently, draining every child's output from a
+    single selector loop and printing each test's output once it finishes"""
+    results = []
+    selector = selectors.DefaultSelector()
+
+    for test_file, description in tests:
+        try:
+            proc = _launch_test(test_file)
+        except Exception as e:
+            results.append(
+                (description, report_test(description, False, f"ERROR: {e}"))
+            )
+            continue
+
+        deadline = time.monotonic() + TEST_TIMEOUT
+        selector.register(
+            proc.stdout,
+            selectors.EVENT_READ,
+            (proc, description, bytearray(), deadline),
         )
 
-        if result.returncode == 0:
-            print(f"✅ {description} - PASSED")
-            return True
-        else:
-            print(f"❌ {description} - FAILED (exit code: {result.returncode})")
-            return False
+    while selector.get_map():
+        for key, _ in selector.select(timeout=0.1):
+            proc, description, buffer, deadline = key.data
+            chunk = os.read(key.fd, 65536)
+            if chunk:
+                buffer += chunk
+                continue
+
+            # EOF: the child has exited or closed its output
+            selector.unregister(key.fileobj)
+            key.fileobj.close()
+            output = buffer.decode("utf-8", errors="replace")
+            try:
+                returncode = proc.wait(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                returncode = proc.wait()
+
+            if time.monotonic() > deadline:
+                success = False
+                output += f"\n⏰ TIMEOUT ({TEST_TIMEOUT}s)"
+            elif returncode == 0:
+                success = True
+            else:
+                success = False
+                output += f"\n(exit code: {returncode})"
+
+            results.append((description, report_test(description, success, output)))
+
+        # Kill children that ran past their deadline; their pipe then hits EOF
+        now = time.monotonic()
+        for key in list(selector.get_map().values()):
+            proc, _, _, deadline = key.data
+            if now > deadline and proc.poll() is None:
+                proc.kill()
+
+    selector.close()
+    return results
+
+
+def run_test(test_file: Path, description: str) -> bool:
+    """Run a single test file and return success status"""
+    return run_tests([(test_file, description)])[0][1]
 
-    except subprocess.TimeoutExpired:
-        print(f"⏰ {description} - TIMEOUT (60s)")
+
+def _display_live() -> bool:
+    """Check that the GUI display actually answers, not just that the
+    environment variables are set (stale SSH sessions, hung X servers)"""
+    if not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
         return False
-    except Exception as e:
-        print(f"❌ {description} - ERROR: {e}")
+
+    # Without an X display or xdpyinfo there is no cheap probe; trust the env
+    if not os.environ.get("DISPLAY") or not shutil.which("xdpyinfo"):
+        return True
+
+    try:
+        result = subprocess.run(
+            ["xdpyinfo"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=1,
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, OSError):
         return False
 
 
@@ -44,30 +182,19 @@ def check_dependencies():
     """Check if required dependencies are available"""
     print("🔍 Checking dependencies...")
 
-    dependencies = {
-        "gi": "PyGObject (for GTK)",
-        "requests": "Requests (for webhooks)",
-    }
-
     missing = []
 
-    for module, description in dependencies.items():
-        try:
-            __import__(module)
+    for module, description in DEPENDENCIES:
+        # find_spec locates the package without running its import-time code
+        if importlib.util.find_spec(module) is not None:
             print(f"   ✅ {description}")
-        except ImportError:
+        else:
             print(f"   ❌ {description} - MISSING")
             missing.append(description)
 
     # Check system commands
-    system_commands = {
-        "notify-send": "Desktop notifications (Linux)",
-        "ping": "Network ping",
-    }
-
-    for command, description in system_commands.items():
-        result = subprocess.run(["which", command], capture_output=True)
-        if result.returncode == 0:
+    for command, description in SYSTEM_COMMANDS:
+        if shutil.which(command):
             print(f"   ✅ {description}")
         else:
             print(f"   ⚠️  {description} - Not available (some tests may be limited)")
@@ -94,36 +221,34 @@ def main():
             print("Exiting...")
             return
 
-    # Define tests to run
-    test_dir = Path(__file__).parent
-    tests = [
-        (test_dir / "test_settings.py", "Settings Manager"),
-        (test_dir / "test_health_checker.py", "Health Checker"),
-        (test_dir / "test_status_tracker.py", "Status Tracker"),
-        (test_dir / "test_notifications.py", "Notification System"),
-    ]
-
-    # Check if GUI is available for system tray test
-    if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"):
-        tests.append((test_dir / "test_system_tray.py", "System Tray Integration"))
+    # The system tray test needs the display and a GTK main loop, so it runs
+    # on its own after the independent tests have finished
+    gui_tests = []
+    if _display_live():
+        gui_tests.append(SYSTEM_TRAY_TEST)
     else:
-        print("\n⚠️  No GUI environment detected. Skipping system tray test.")
+        print("\n⚠️  No live GUI display detected. Skipping system tray test.")
 
     # Run tests
     results = []
     start_time = time.time()
 
-    for test_file, description in tests:
-        if not test_file.exists():
-            print(f"❌ Test file not found: {test_file}")
-            results.append((description, False))
-            continue
+    # Drop missing test files once, up front
+    missing = [test for test in TESTS + tuple(gui_tests) if not test[0].exists()]
+    for test_file, description in missing:
+        print(f"❌ Test file not found: {test_file}")
+        results.append((description, False))
+
+    runnable = [test for test in TESTS if test not in missing]
+    gui_tests = [test for test in gui_tests if test not in missing]
+
+    prewarm_bytecode()
 
-        success = run_test(test_file, description)
-        results.append((description, success))
+    # Independent tests run concurrently; output is printed per test as each finishes
+    results.extend(run_tests(runnable))
 
-        # Small delay between tests
-        time.sleep(1)
+    for test_file, description in gui_tests:
+        results.append((description, run_test(test_file, description)))
 
     # Summary
     total_time = time.time() - start_time
@@ -3,14 +3,9 @@
 Test Notifications System
 """
 
-import sys
 import os
-from pathlib import Path
 import time
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from core.notifications import NotificationManager
 from core.settings import NotificationSettings
 
@@ -32,6 +27,10 @@ def test_notifications():
     notifier = NotificationManager(settings)
     print("✅ Notification manager initialized")
 
+    # Drive the notifier's clock by hand instead of sleeping between calls
+    fake_clock = [time.monotonic()]
+    notifier._now = lambda: fake_clock[0]
+
     # Test system availability
     print(
         f"\n🖥️  Desktop notifications available: {'✅' if notifier.desktop_available else '❌'}"
@@ -68,21 +67,21 @@ def test_notifications():
             "Web Server", "operational", "down", 0, "Connection timeout"
         )
         print("   📤 Sent 'service down' notification")
-        time.sleep(2)
+        fake_clock[0] += 2.0
 
         # Service restored notification
         notifier.notify_status_change(
             "Web Server", "down", "operational", 150, "Service restored"
         )
         print("   📤 Sent 'service restored' notification")
-        time.sleep(2)
+        fake_clock[0] += 2.0
 
         # Service degraded notification
         notifier.notify_status_change(
             "Database", "operational", "degraded", 2500, "High response time"
         )
         print("   📤 Sent 'service degraded' notification")
-        time.sleep(2)
+        fake_clock[0] += 2.0
     else:
         print("   ⚠️  Desktop notifications not available, skipping visual tests")
 
@@ -92,7 +91,7 @@ def test_notifications():
     if notifier.desktop_available:
         notifier.notify_slow_response("API Gateway", 3000, 1000)
         print("   📤 Sent 'slow response' notification")
-        time.sleep(2)
+        fake_clock[0] += 2.0
 
     # Test webhook formatting (without actually sending)
     print(f"\n🪝 Testing webhook formatting...")
@@ -140,10 +139,8 @@ def test_notifications():
     notifier.notify_status_change("Service B", "operational", "down")
     notifier.notify_status_change("Service C", "operational", "down")
 
-    # Wait for grouping
-    import time
-
-    time.sleep(6)
+    # Flush the grouping window
+    notifier.force_send_pending()
 
     # Test smart rules
     print("  Testing smart rules (should suppress repeated states)...")
@@ -162,6 +159,9 @@ def test_notifications():
         stats = notifier.get_notification_stats()
         print(f"  Enhanced notification stats: {stats}")
 
+    # Flush the last batch rather than waiting for the grouping timer at exit
+    notifier.close()
+
     print(f"\n🎉 Enhanced notification tests completed!")
 
 
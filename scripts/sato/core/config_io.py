@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+JSON helpers for the Sato configuration maintenance scripts
+Uses orjson when it is installed and falls back to the standard library
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def json_loads(data: bytes):
+    """Parse JSON from raw file bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to JSON bytes indented by two spaces"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def read_json(path):
+    """Load a JSON file"""
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+
+def atomic_write(path, data: bytes):
+    """Write through a temporary file and rename it over path, so readers
+    (and a crash mid-write) never leave a half-written file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_json(path, obj, original: Optional[bytes] = None) -> bool:
+    """Write a JSON file unless it would match original byte for byte;
+    returns whether the file was written"""
+    data = json_dumps(obj)
+    if data == original:
+        return False
+    atomic_write(path, data)
+    return True
+
+
+CONFIG_PATH = "config/config.json"
+SETTINGS_PATH = "config/settings.json"
+
+
+@dataclass
+class ConfigBundle:
+    """config.json and settings.json loaded once, mutated in memory and
+    written back only if a mutator actually changed them"""
+
+    config: Optional[list] = None
+    settings: Optional[dict] = None
+    config_dirty: bool = False
+    settings_dirty: bool = False
+    config_path: str = CONFIG_PATH
+    settings_path: str = SETTINGS_PATH
+    config_raw: Optional[bytes] = None
+    settings_raw: Optional[bytes] = None
+
+    @classmethod
+    def load(
+        cls, config_path: str = CONFIG_PATH, settings_path: str = SETTINGS_PATH
+    ) -> "ConfigBundle":
+        """Read whichever of the two files exist"""
+        bundle = cls(config_path=config_path, settings_path=settings_path)
+        if os.path.exists(config_path):
+            with open(config_path, "rb") as f:
+                bundle.config_raw = f.read()
+            bundle.config = json_loads(bundle.config_raw)
+        if os.path.exists(settings_path):
+            with open(settings_path, "rb") as f:
+                bundle.settings_raw = f.read()
+            bundle.settings = json_loads(bundle.settings_raw)
+        return bundle
+
+    def save(self):
+        """Write back only the files that changed"""
+        if self.config_dirty and self.config is not None:
+            write_json(self.config_path, self.config, self.config_raw)
+            self.config_dirty = False
+        if self.settings_dirty and self.settings is not None:
+            write_json(self.settings_path, self.settings, self.settings_raw)
+            self.settings_dirty = False
+
+
+def set_value(data: dict, key: str, value) -> bool:
+    """Set data[key] and report whether that changed anything"""
+    changed = key not in data or data[key] != value
+    data[key] = value
+    return changed
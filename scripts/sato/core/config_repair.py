@@ -4,23 +4,19 @@ Sato Configuration Repair Utility
 Fixes common configuration errors and compatibility issues
 """
 
-import json
-import os
+try:
+    from .config_io import ConfigBundle, set_value
+except ImportError:  # Run directly as a script
+    from config_io import ConfigBundle, set_value
 
 
-def fix_config_errors():
-    """Fix configuration errors that prevent Sato from starting"""
-
-    print("🔧 Fixing Sato configuration errors...")
+def repair_config(bundle: ConfigBundle):
+    """Remove unsupported fields from the loaded config and settings"""
 
     # Fix 1: Clean up config.json - remove unsupported fields
-    config_path = "config/config.json"
-    if os.path.exists(config_path):
-        with open(config_path, "r") as f:
-            config = json.load(f)
-
+    if bundle.config is not None:
         fixed_count = 0
-        for server in config:
+        for server in bundle.config:
             # Remove auto_restart and restart_command (not supported yet)
             if "auto_restart" in server:
                 del server["auto_restart"]
@@ -30,15 +26,12 @@ def fix_config_errors():
                 fixed_count += 1
 
         if fixed_count > 0:
-            with open(config_path, "w") as f:
-                json.dump(config, f, indent=2)
+            bundle.config_dirty = True
             print(f"✅ Removed {fixed_count} unsupported config fields")
 
     # Fix 2: Clean up settings.json - remove unsupported fields
-    settings_path = "config/settings.json"
-    if os.path.exists(settings_path):
-        with open(settings_path, "r") as f:
-            settings = json.load(f)
+    if bundle.settings is not None:
+        settings = bundle.settings
 
         # Remove unsupported monitoring fields
         monitoring = settings.get("monitoring", {})
@@ -67,13 +60,23 @@ def fix_config_errors():
                 removed_fields.append(field)
 
         # Keep the increased check interval (this is supported)
-        monitoring["global_check_interval"] = 30
+        if set_value(monitoring, "global_check_interval", 30):
+            bundle.settings_dirty = True
 
         if removed_fields:
-            with open(settings_path, "w") as f:
-                json.dump(settings, f, indent=2)
+            bundle.settings_dirty = True
             print(f"✅ Removed unsupported settings: {', '.join(removed_fields)}")
 
+
+def fix_config_errors():
+    """Fix configuration errors that prevent Sato from starting"""
+
+    print("🔧 Fixing Sato configuration errors...")
+
+    bundle = ConfigBundle.load()
+    repair_config(bundle)
+    bundle.save()
+
     print("\n🎯 Configuration cleaned up:")
     print("  • Removed unsupported auto_restart fields")
     print("  • Removed unsupported monitoring fields")
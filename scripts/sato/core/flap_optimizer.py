@@ -4,61 +4,74 @@ Sato Flap Detection Optimizer
 Optimizes monitoring intervals and reduces alert spam from flapping services
 """
 
-import json
-import os
+import re
 
+try:
+    from .config_io import ConfigBundle, set_value
+    from .config_repair import repair_config
+except ImportError:  # Run directly as a script
+    from config_io import ConfigBundle, set_value
+    from config_repair import repair_config
 
-def apply_final_fixes():
-    """Apply all fixes to stop flapping and alert spam"""
+# Hosts that get the longer external-API interval
+_EXTERNAL_API_RE = re.compile(r"nass\.iq|cardhouzz\.online")
 
-    print("🔧 Applying final fixes for flapping services...")
 
-    # Fix 1: Update config with proper service-specific intervals
-    config_path = "config/config.json"
-    if os.path.exists(config_path):
-        with open(config_path, "r") as f:
-            config = json.load(f)
+def optimize_config(bundle: ConfigBundle):
+    """Apply flap-reducing intervals and thresholds to the loaded config"""
 
-        for server in config:
+    # Fix 1: Update config with proper service-specific intervals
+    if bundle.config is not None:
+        changed = False
+        for server in bundle.config:
             # Set longer intervals for external APIs
-            if any(
-                domain in server.get("host", "")
-                for domain in ["nass.iq", "cardhouzz.online"]
-            ):
-                server["check_interval"] = 120  # 2 minutes for external APIs
-                server["timeout"] = 10  # Longer timeout
+            if _EXTERNAL_API_RE.search(server.get("host", "")):
+                changed |= set_value(server, "check_interval", 120)  # 2 minutes
+                changed |= set_value(server, "timeout", 10)  # Longer timeout
                 print(f"  ✅ Set 2-minute interval for external API: {server['name']}")
             else:
                 # Default interval for other services
                 if "check_interval" not in server:
-                    server["check_interval"] = 30
+                    changed |= set_value(server, "check_interval", 30)
 
-        with open(config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        if changed:
+            bundle.config_dirty = True
 
     # Fix 2: Optimize settings for stability
-    settings_path = "config/settings.json"
-    if os.path.exists(settings_path):
-        with open(settings_path, "r") as f:
-            settings = json.load(f)
+    if bundle.settings is not None:
+        monitoring = bundle.settings["monitoring"]
+        notifications = bundle.settings["notifications"]
+        changed = False
 
         # Monitoring optimizations
-        settings["monitoring"]["global_check_interval"] = 60  # 1 minute default
-        settings["monitoring"]["max_response_time_warning"] = 3000  # 3 seconds
-        settings["monitoring"]["max_response_time_critical"] = 8000  # 8 seconds
+        changed |= set_value(monitoring, "global_check_interval", 60)  # 1 minute
+        changed |= set_value(monitoring, "max_response_time_warning", 3000)  # 3s
+        changed |= set_value(monitoring, "max_response_time_critical", 8000)  # 8s
 
         # Notification optimizations
-        settings["notifications"][
-            "notify_on_status_change"
-        ] = True  # Re-enable but with flap detection
-        settings["notifications"]["desktop_notifications"] = True
-        settings["notifications"]["notification_timeout"] = 8000  # Longer timeout
+        changed |= set_value(
+            notifications, "notify_on_status_change", True
+        )  # Re-enable but with flap detection
+        changed |= set_value(notifications, "desktop_notifications", True)
+        changed |= set_value(
+            notifications, "notification_timeout", 8000
+        )  # Longer timeout
 
-        with open(settings_path, "w") as f:
-            json.dump(settings, f, indent=2)
+        if changed:
+            bundle.settings_dirty = True
 
         print("✅ Optimized monitoring and notification settings")
 
+
+def apply_final_fixes():
+    """Apply all fixes to stop flapping and alert spam"""
+
+    print("🔧 Applying final fixes for flapping services...")
+
+    bundle = ConfigBundle.load()
+    optimize_config(bundle)
+    bundle.save()
+
     print("\n🎯 Final fixes applied:")
     print("  • External APIs: 2-minute check intervals")
     print("  • Local services: 30-second intervals")
@@ -73,16 +86,26 @@ def apply_final_fixes():
     print("  4. Use Ctrl+X for maintenance mode if needed")
 
 
+def repair_and_optimize():
+    """Run the config repair and the flap fixes in one read/write pass"""
+
+    print("🔧 Repairing and optimizing Sato configuration...")
+
+    bundle = ConfigBundle.load()
+    repair_config(bundle)
+    optimize_config(bundle)
+    bundle.save()
+
+    print("\n🚀 Restart Sato to apply all changes")
+
+
 def show_current_config():
     """Show current configuration for verification"""
     print("📋 Current Configuration:")
 
-    config_path = "config/config.json"
-    if os.path.exists(config_path):
-        with open(config_path, "r") as f:
-            config = json.load(f)
-
-        for server in config:
+    bundle = ConfigBundle.load()
+    if bundle.config is not None:
+        for server in bundle.config:
             interval = server.get("check_interval", "default")
             timeout = server.get("timeout", "default")
             print(f"  • {server['name']}: {interval}s interval, {timeout}s timeout")
@@ -93,5 +116,7 @@ if __name__ == "__main__":
 
     if len(sys.argv) > 1 and sys.argv[1] == "show":
         show_current_config()
+    elif len(sys.argv) > 1 and sys.argv[1] == "all":
+        repair_and_optimize()
     else:
         apply_final_fixes()
@@ -3,17 +3,29 @@
 Enhanced Health Checker with Multiple Check Types
 """
 
+import asyncio
+import errno
+import os
+import selectors
 import socket
+import struct
+import sys
 import subprocess
+import threading
 import time
-import urllib.request
-import urllib.error
 import urllib.parse
-from typing import Tuple, Optional, List
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Tuple, Optional, List, FrozenSet
 from enum import Enum
+from functools import lru_cache
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import json
 import re
 
+from .settings import DEFAULT_EXPECTED_STATUS_CODES
+
 
 class CheckResult:
     def __init__(
@@ -23,109 +35,532 @@ class CheckResult:
         message: str = "",
         status_code: Optional[int] = None,
         details: Optional[dict] = None,
+        cache_ttl: Optional[float] = None,
     ):
         self.is_healthy = is_healthy
         self.response_time = response_time
         self.message = message
         self.status_code = status_code
         self.details = details or {}
+        # Seconds the result stays valid, if the check knows better than
+        # the optimizer's response-time heuristic
+        self.cache_ttl = cache_ttl
+
+
+_DEFAULT_CODE_SETS = (frozenset((200,)), frozenset(DEFAULT_EXPECTED_STATUS_CODES))
+
+
+@dataclass(frozen=True)
+class NormalizedConfig:
+    """Fixed-shape view of the fields a health check reads from a server config"""
+
+    host: str
+    port: Optional[int] = None
+    check_type: str = "http"
+    custom_endpoint: Optional[str] = None
+    expected_status_codes: FrozenSet[int] = frozenset((200,))
+    expected_content: Optional[str] = None
+    expected_content_bytes: Optional[bytes] = None
+    custom_headers: Tuple[Tuple[str, str], ...] = ()
+    body_read_size: int = 200
+    request_headers: Tuple[Tuple[str, str], ...] = (("Range", "bytes=0-199"),)
+    custom_command: Tuple[str, ...] = ()
+    tcp_send_data: Optional[str] = None
+    tcp_expect_data: Optional[str] = None
+
+    @classmethod
+    def from_server(cls, server_config) -> "NormalizedConfig":
+        """Probe the optional attributes of a server config once"""
+        check_type = server_config.check_type
+        command = getattr(server_config, "custom_command", None) or ()
+        expected_content = getattr(server_config, "expected_content", None) or None
+        expected_bytes = expected_content.encode("utf-8") if expected_content else None
+        custom_headers = tuple(
+            (getattr(server_config, "custom_headers", None) or {}).items()
+        )
+        # Ranged GET covering the bytes the content check needs
+        body_read_size = max(200, len(expected_bytes) + 64) if expected_bytes else 200
+        request_headers = (("Range", f"bytes=0-{body_read_size - 1}"),) + custom_headers
+        if isinstance(command, str):
+            command = command.split()
+        # The default code lists also accept 206, the answer to our own Range
+        # header; a list the user chose is taken as is
+        expected_codes = frozenset(
+            getattr(server_config, "expected_status_codes", None) or (200,)
+        )
+        if expected_codes in _DEFAULT_CODE_SETS:
+            expected_codes |= {206}
+
+        return cls(
+            host=server_config.host,
+            port=getattr(server_config, "port", None),
+            check_type=getattr(check_type, "value", check_type),
+            custom_endpoint=getattr(server_config, "custom_endpoint", None),
+            expected_status_codes=expected_codes,
+            expected_content=expected_content,
+            expected_content_bytes=expected_bytes,
+            custom_headers=custom_headers,
+            body_read_size=body_read_size,
+            request_headers=request_headers,
+            custom_command=tuple(command),
+            tcp_send_data=getattr(server_config, "tcp_send_data", None) or None,
+            tcp_expect_data=getattr(server_config, "tcp_expect_data", None),
+        )
+
+
+@lru_cache(maxsize=512)
+def _build_url_cached(
+    host: str, port: Optional[int], custom_endpoint: Optional[str]
+) -> str:
+    """Build URL from the server configuration fields it depends on"""
+    # If it's already a full URL, use it
+    if "://" in host:
+        # Add custom endpoint if specified
+        if custom_endpoint:
+            if not host.endswith("/"):
+                host += "/"
+            host += custom_endpoint.lstrip("/")
+        return host
+
+    # Build URL from components
+    # Use HTTPS for port 443 or any port ending in 443 (like 5443, 8443)
+    protocol = (
+        "https" if (port == 443 or (port and str(port).endswith("443"))) else "http"
+    )
+
+    if port and port not in [80, 443]:
+        url = f"{protocol}://{host}:{port}"
+    else:
+        url = f"{protocol}://{host}"
+
+    # Add custom endpoint
+    if custom_endpoint:
+        if not url.endswith("/"):
+            url += "/"
+        url += custom_endpoint.lstrip("/")
+
+    return url
+
+
+# Minimal headers for speed; the connection is kept alive for reuse
+_CHECK_HEADERS = {
+    "User-Agent": "SatoMonitor/1.0",  # Shorter user agent
+    "Accept": "*/*",
+    "Cache-Control": "no-cache, no-store",
+    "Pragma": "no-cache",
+}
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session() -> requests.Session:
+    """Return the process-wide keep-alive session used for HTTP checks"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            session.headers.update(_CHECK_HEADERS)
+            adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+@lru_cache(maxsize=512)
+def _extract_hostname_cached(host: str) -> str:
+    """Extract hostname from URL or host string"""
+    if "://" in host:
+        parsed = urllib.parse.urlparse(host)
+        return parsed.hostname or parsed.netloc.split(":")[0]
+
+    # Remove port if present
+    if ":" in host:
+        return host.split(":")[0]
+
+    return host
+
+
+# Ping command prefix; Windows takes the wait in ms, Linux/macOS in seconds
+_IS_WINDOWS = sys.platform.startswith("win")
+_PING_COMMAND = ("ping", "-n", "1", "-w") if _IS_WINDOWS else ("ping", "-c", "1", "-W")
+
+# Ping output patterns used by extract_ping_time
+_PING_TIME_RE = re.compile(r"time[=<](\d+(?:\.\d+)?)\s*ms", re.IGNORECASE)
+_PING_MS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*ms")
+
+_ICMP_HEADER = struct.Struct("!BBHHH")  # type, code, checksum, id, sequence
+_ICMP_PAYLOAD = b"SatoMonitor-ping"
+
+
+def _icmp_checksum(packet) -> int:
+    """RFC 1071 ones' complement checksum"""
+    if len(packet) % 2:
+        packet = bytes(packet) + b"\0"
+    total = sum(struct.unpack(f"!{len(packet) // 2}H", packet))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class _IcmpEchoSocket:
+    """ICMP echo socket owned by one thread and reused for every ping
+
+    Uses an unprivileged datagram socket when net.ipv4.ping_group_range
+    allows it, otherwise a raw socket (root or CAP_NET_RAW). Creating
+    either raises OSError (PermissionError when not permitted) when neither
+    is available.
+    """
+
+    def __init__(self):
+        try:
+            self.sock = socket.socket(
+                socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP
+            )
+            self.raw = False
+        except OSError:  # Not permitted, or no ICMP datagram sockets here
+            self.sock = socket.socket(
+                socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP
+            )
+            self.raw = True
+
+        # Datagram sockets get their id rewritten by the kernel; raw sockets
+        # see every reply on the host, so match on our own id as well
+        self.ident = (os.getpid() ^ threading.get_ident()) & 0xFFFF
+        self.seq = 0
+        self.packet = bytearray(_ICMP_HEADER.size + len(_ICMP_PAYLOAD))
+        self.packet[_ICMP_HEADER.size :] = _ICMP_PAYLOAD
+
+    def ping(self, address: str, timeout: float) -> Optional[int]:
+        """Send one echo request and return the RTT in ms, or None on timeout"""
+        self.seq = (self.seq + 1) & 0xFFFF
+        _ICMP_HEADER.pack_into(self.packet, 0, 8, 0, 0, self.ident, self.seq)
+        struct.pack_into("!H", self.packet, 2, _icmp_checksum(self.packet))
+
+        start_ns = time.monotonic_ns()
+        deadline = start_ns + int(timeout * 1_000_000_000)
+        self.sock.sendto(self.packet, (address, 0))
+
+        while True:
+            remaining = (deadline - time.monotonic_ns()) / 1_000_000_000
+            if remaining <= 0:
+                return None
+            self.sock.settimeout(remaining)
+            try:
+                data, (source, _) = self.sock.recvfrom(1024)
+            except socket.timeout:
+                return None
+
+            # Raw sockets, and datagram sockets on macOS, include the IPv4
+            # header; an ICMP message never starts with version nibble 4
+            if data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4 :]
+            if source != address or len(data) < _ICMP_HEADER.size:
+                continue
+
+            icmp_type, _, _, ident, seq = _ICMP_HEADER.unpack_from(data)
+            # Replies left over from an earlier timed-out ping are skipped
+            if (
+                icmp_type == 0
+                and seq == self.seq
+                and (not self.raw or ident == self.ident)
+            ):
+                return (time.monotonic_ns() - start_ns) // 1_000_000
+
+
+# Output kept from each stream of a custom check command
+CUSTOM_OUTPUT_LIMIT = 4096
+
+
+def _run_capped(cmd, timeout: float) -> Tuple[int, bytes, bytes]:
+    """Run cmd keeping at most CUSTOM_OUTPUT_LIMIT bytes of stdout and stderr
+
+    The rest of the output is drained and discarded so a chatty command
+    cannot block on a full pipe or grow our memory. Raises
+    subprocess.TimeoutExpired after killing the command at the deadline.
+    """
+    deadline = time.monotonic() + timeout
+    proc = subprocess.Popen(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    stdout_fd, stderr_fd = proc.stdout.fileno(), proc.stderr.fileno()
+    outputs = {stdout_fd: bytearray(), stderr_fd: bytearray()}
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(proc.stdout, selectors.EVENT_READ)
+        selector.register(proc.stderr, selectors.EVENT_READ)
+        try:
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    proc.kill()
+                    proc.wait()
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+
+                for key, _ in selector.select(timeout=remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        continue
+                    buffer = outputs[key.fd]
+                    if len(buffer) < CUSTOM_OUTPUT_LIMIT:
+                        buffer += chunk[: CUSTOM_OUTPUT_LIMIT - len(buffer)]
+
+            returncode = proc.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            proc.stdout.close()
+            proc.stderr.close()
+
+    return returncode, bytes(outputs[stdout_fd]), bytes(outputs[stderr_fd])
+
+
+# check_http failure labels, by exception type and then by errno
+_ERROR_LABELS = {
+    socket.timeout: "Timeout",
+    socket.gaierror: "DNS failed",
+    ConnectionRefusedError: "Connection failed",
+    ConnectionResetError: "Connection failed",
+    ConnectionAbortedError: "Connection failed",
+}
+_ERRNO_LABELS = {
+    errno.ETIMEDOUT: "Timeout",
+    errno.ECONNREFUSED: "Connection failed",
+    errno.ECONNRESET: "Connection failed",
+    errno.EHOSTUNREACH: "Connection failed",
+    errno.ENETUNREACH: "Connection failed",
+    socket.EAI_NONAME: "DNS failed",
+}
+
+
+def _error_label(error: BaseException) -> str:
+    """Label a request failure by walking its wrapped causes"""
+    current = error
+    for _ in range(8):  # requests -> urllib3 -> socket nesting is shallow
+        label = _ERROR_LABELS.get(type(current)) or _ERRNO_LABELS.get(
+            getattr(current, "errno", None)
+        )
+        if label is not None:
+            return label
+
+        cause = getattr(current, "reason", None)
+        if not isinstance(cause, BaseException):
+            cause = current.__cause__ or current.__context__
+        if cause is None and current.args and isinstance(current.args[0], Exception):
+            cause = current.args[0]
+        if cause is None:
+            break
+        current = cause
+
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "Connection failed"
+    return "Network error"
+
+
+# Bounded pool that runs blocking probes for check_server_async/check_servers
+CHECK_POOL_SIZE = 32
+_check_executor = ThreadPoolExecutor(
+    max_workers=CHECK_POOL_SIZE, thread_name_prefix="sato-check"
+)
+
+
+def check_executor() -> ThreadPoolExecutor:
+    """The shared pool of CHECK_POOL_SIZE threads that runs blocking checks"""
+    return _check_executor
+
+
+# addrinfo shared by every checker: (host, port) -> (resolved at, addrinfo)
+DNS_CACHE_TTL = 300  # seconds
+DNS_CACHE_MAX_ENTRIES = 1024
+_dns_cache: Dict[Tuple[str, int], tuple] = {}
+_dns_lock = threading.Lock()
+
+
+def resolve(host: str, port: int) -> list:
+    """Resolve host:port for TCP, reusing cached addrinfo within the TTL"""
+    key = (host, port)
+    now = time.monotonic()
+    cached = _dns_cache.get(key)
+    if cached and now - cached[0] < DNS_CACHE_TTL:
+        return cached[1]
+
+    addrinfo = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    with _dns_lock:
+        if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+            # Drop expired entries, or everything if none has expired yet
+            expired = [k for k, v in _dns_cache.items() if now - v[0] >= DNS_CACHE_TTL]
+            for k in expired or list(_dns_cache):
+                del _dns_cache[k]
+        _dns_cache[key] = (now, addrinfo)
+    return addrinfo
+
+
+def clear_dns_cache():
+    """Forget every cached DNS result"""
+    with _dns_lock:
+        _dns_cache.clear()
 
 
 class HealthChecker:
+    CONNECTIVITY_CACHE_TTL = 1.0  # seconds
+
     def __init__(self):
         self.user_agent = "ServerMonitor/2.0"
-        # Performance optimization: cache DNS lookups
-        self._dns_cache = {}
-        self._last_dns_clear = time.time()
+
+        # Pooled keep-alive session shared by all checkers so HTTP checks
+        # reuse TCP/TLS connections
+        self._session = _get_http_session()
+
+        # (monotonic time, result) of the last internet connectivity probe
+        self._connectivity_cache = (float("-inf"), False)
+
+        # Per-thread ICMP echo sockets, reused across ping checks
+        self._icmp_local = threading.local()
+        self._icmp_unavailable = False
+
+        # NormalizedConfig per server config object, keyed by id()
+        self._normalized = {}
+
+    def normalize(self, server_config) -> NormalizedConfig:
+        """Return the cached NormalizedConfig for a server config"""
+        if isinstance(server_config, NormalizedConfig):
+            return server_config
+
+        entry = self._normalized.get(id(server_config))
+        if entry is None or entry[0] is not server_config:
+            # Keep the config alive alongside its view so the id is not reused
+            entry = (server_config, NormalizedConfig.from_server(server_config))
+            self._normalized[id(server_config)] = entry
+        return entry[1]
 
     def check_server(self, server_config, timeout: int = 5) -> CheckResult:
         """Main entry point for server health checks"""
-        check_type = (
-            server_config.check_type.value
-            if hasattr(server_config.check_type, "value")
-            else server_config.check_type
-        )
+        cfg = self.normalize(server_config)
+        check_type = cfg.check_type
 
         if check_type == "http":
-            return self.check_http(server_config, timeout)
+            return self.check_http(cfg, timeout)
         elif check_type == "ping":
-            return self.check_ping(server_config, timeout)
+            return self.check_ping(cfg, timeout)
         elif check_type == "tcp":
-            return self.check_tcp(server_config, timeout)
+            return self.check_tcp(cfg, timeout)
         elif check_type == "custom":
-            return self.check_custom(server_config, timeout)
+            return self.check_custom(cfg, timeout)
         else:
             return CheckResult(False, 0, f"Unknown check type: {check_type}")
 
-    def check_http(self, server_config, timeout: int) -> CheckResult:
-        """Highly optimized HTTP/HTTPS health check"""
-        start_time = time.time()
-
+    async def check_server_async(self, server_config, timeout: int = 5) -> CheckResult:
+        """Awaitable check_server; the blocking probe runs on the shared pool"""
+        loop = asyncio.get_running_loop()
         try:
-            # Build URL
-            url = self.build_url(server_config)
+            return await loop.run_in_executor(
+                _check_executor, self.check_server, server_config, timeout
+            )
+        except Exception as e:
+            return CheckResult(False, 0, f"Check failed: {str(e)}")
 
-            # Use HEAD request by default for faster checks (unless content verification needed)
-            need_content_check = (
-                hasattr(server_config, "expected_content")
-                and server_config.expected_content
+    def check_servers(self, servers, timeout: int = 5, on_result=None) -> dict:
+        """Check (index, server) pairs concurrently and return {index: result}
+
+        on_result(index, result) is called as each check finishes, so callers
+        can update the UI without waiting for the slowest server.
+        """
+
+        async def check_one(index, server):
+            result = await self.check_server_async(server, timeout)
+            if on_result is not None:
+                on_result(index, result)
+            return index, result
+
+        async def check_all():
+            return await asyncio.gather(
+                *(check_one(index, server) for index, server in servers)
             )
 
-            # Create optimized request
-            req = urllib.request.Request(url)
+        return dict(asyncio.run(check_all()))
 
-            # Use HEAD method for faster checks when content verification not needed
-            if not need_content_check:
-                req.get_method = lambda: "HEAD"
+    def check_http(self, server_config, timeout: int) -> CheckResult:
+        """Highly optimized HTTP/HTTPS health check"""
+        start_ns = time.monotonic_ns()
 
-            # Minimal headers for speed
-            req.add_header("User-Agent", "SatoMonitor/1.0")  # Shorter user agent
-            req.add_header("Connection", "close")
-            req.add_header("Accept", "*/*")
-            req.add_header("Cache-Control", "no-cache, no-store")
-            req.add_header("Pragma", "no-cache")
+        try:
+            cfg = self.normalize(server_config)
 
-            # Add custom headers if specified (but warn about performance impact)
-            if (
-                hasattr(server_config, "custom_headers")
-                and server_config.custom_headers
-            ):
-                for header, value in server_config.custom_headers.items():
-                    req.add_header(header, value)
+            # Build URL
+            url = self.build_url(cfg)
+
+            need_content_check = cfg.expected_content is not None
+
+            # Base headers live on the shared session; the per-server Range and
+            # custom headers are prebuilt in the normalized config
+            headers = dict(cfg.request_headers)
 
             # Fast timeout optimization for responsiveness
             actual_timeout = min(
                 timeout, 3
             )  # Max 3 seconds for HTTP checks (optimized for quick response)
 
-            # Clear DNS cache periodically for fresh lookups
-            current_time = time.time()
-            if current_time - self._last_dns_clear > 300:  # Every 5 minutes
-                self._dns_cache.clear()
-                self._last_dns_clear = current_time
+            # One ranged GET serves both the status and the content check:
+            # servers that honour Range send only body_read_size bytes, and
+            # some servers answer HEAD slowly by running a full GET anyway
+            method = "GET"
+
+            response = self._session.request(
+                method,
+                url,
+                headers=headers,
+                timeout=actual_timeout,
+                allow_redirects=True,
+                stream=True,
+            )
+            if response.status_code == 416:
+                # An empty body cannot satisfy our Range; ask again without it
+                response.close()
+                headers.pop("Range", None)
+                response = self._session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    timeout=actual_timeout,
+                    allow_redirects=True,
+                    stream=True,
+                )
 
-            with urllib.request.urlopen(req, timeout=actual_timeout) as response:
-                response_time = int((time.time() - start_time) * 1000)
-                status_code = response.getcode()
+            with response:
+                response_time = (time.monotonic_ns() - start_ns) // 1_000_000
+                status_code = response.status_code
 
                 # Fast status code check
-                expected_codes = getattr(server_config, "expected_status_codes", [200])
-                is_healthy = status_code in expected_codes
+                is_healthy = status_code in cfg.expected_status_codes
 
-                # Only read response body if absolutely necessary
-                body = ""
-                if need_content_check:
-                    try:
-                        # Read minimal bytes for content verification
-                        body = response.read(200).decode("utf-8", errors="ignore")
+                if status_code >= 400:
+                    # Simplified error message for speed
+                    message = f"HTTP {status_code}"
+                    details = {"status_code": status_code}
+                    return CheckResult(
+                        is_healthy, response_time, message, status_code, details
+                    )
+
+                # Read the (ranged) head of the body; a fully read short body
+                # also lets the connection go back to the pool
+                try:
+                    body = next(response.iter_content(cfg.body_read_size), b"")
+                except Exception:
+                    body = None
 
-                        # Quick content check
-                        if server_config.expected_content not in body:
+                if need_content_check:
+                    if body is not None:
+                        # Compare raw bytes, skipping the UTF-8 decode
+                        if cfg.expected_content_bytes not in body:
                             is_healthy = False
                             message = f"Content missing (HTTP {status_code})"
                         else:
                             message = f"HTTP {status_code} ✓"
-                    except:
+                    else:
                         # If content read fails, still consider healthy if status code is good
                         message = f"HTTP {status_code} (content unreadable)"
                 else:
@@ -134,49 +569,31 @@ class HealthChecker:
                 # Minimal details for performance
                 details = {
                     "status_code": status_code,
-                    "method": "HEAD" if not need_content_check else "GET",
+                    "method": method,
                 }
 
                 return CheckResult(
                     is_healthy, response_time, message, status_code, details
                 )
 
-        except urllib.error.HTTPError as e:
-            response_time = int((time.time() - start_time) * 1000)
-            status_code = e.code
-
-            # Fast status code check for HTTP errors
-            expected_codes = getattr(server_config, "expected_status_codes", [200])
-            is_healthy = status_code in expected_codes
-
-            # Simplified error message for speed
-            message = f"HTTP {status_code}"
-            details = {"status_code": status_code}
-
-            return CheckResult(is_healthy, response_time, message, status_code, details)
+        except requests.exceptions.Timeout as e:
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
+            return CheckResult(
+                False, response_time, "Timeout", None, {"error_type": type(e).__name__}
+            )
 
-        except (urllib.error.URLError, socket.timeout, socket.error) as e:
-            response_time = int((time.time() - start_time) * 1000)
+        except (requests.exceptions.RequestException, socket.error) as e:
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
 
             # Fast error categorization
-            if isinstance(e, socket.timeout) or "timeout" in str(e).lower():
-                message = "Timeout"
-            elif "connection" in str(e).lower():
-                message = "Connection failed"
-            elif (
-                "name resolution" in str(e).lower()
-                or "name or service not known" in str(e).lower()
-            ):
-                message = "DNS failed"
-            else:
-                message = "Network error"
+            message = _error_label(e)
 
             return CheckResult(
                 False, response_time, message, None, {"error_type": type(e).__name__}
             )
 
         except Exception as e:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
             # Generic fast error handling
             message = "Check failed"
             return CheckResult(
@@ -185,29 +602,38 @@ class HealthChecker:
 
     def check_ping(self, server_config, timeout: int) -> CheckResult:
         """ICMP ping health check"""
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
 
         try:
             # Extract hostname from URL if needed
-            host = self.extract_hostname(server_config.host)
+            host = self.extract_hostname(self.normalize(server_config).host)
+
+            # In-process ICMP echo over a reused per-thread socket avoids forking
+            # ping for every check; fall back to the ping binary when ICMP
+            # sockets are not permitted or the host has no IPv4 address
+            icmp = self._icmp_socket()
+            if icmp is not None:
+                address = next(
+                    (
+                        info[4][0]
+                        for info in resolve(host, 0)
+                        if info[0] == socket.AF_INET
+                    ),
+                    None,
+                )
+                if address is not None:
+                    return self._check_ping_icmp(icmp, host, address, timeout)
 
             # Build ping command based on OS
             try:
-                # Try to determine OS
-                import platform
-
-                system = platform.system().lower()
-
-                if system == "windows":
-                    cmd = ["ping", "-n", "1", "-w", str(timeout * 1000), host]
-                else:  # Linux/macOS
-                    cmd = ["ping", "-c", "1", "-W", str(timeout), host]
+                wait = timeout * 1000 if _IS_WINDOWS else timeout
+                cmd = [*_PING_COMMAND, str(wait), host]
 
                 # Execute ping
                 result = subprocess.run(
                     cmd, capture_output=True, text=True, timeout=timeout + 1
                 )
-                response_time = int((time.time() - start_time) * 1000)
+                response_time = (time.monotonic_ns() - start_ns) // 1_000_000
 
                 if result.returncode == 0:
                     # Extract actual ping time from output
@@ -233,44 +659,70 @@ class HealthChecker:
                 return CheckResult(False, response_time, message)
 
         except Exception as e:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
             message = f"Ping check failed: {str(e)}"
             details = {"error": str(e)}
 
             return CheckResult(False, response_time, message, None, details)
 
+    def _icmp_socket(self) -> Optional["_IcmpEchoSocket"]:
+        """Return this thread's ICMP echo socket, or None if ICMP sockets are
+        not permitted or not supported here"""
+        if self._icmp_unavailable:
+            return None
+
+        icmp = getattr(self._icmp_local, "socket", None)
+        if icmp is None:
+            try:
+                icmp = _IcmpEchoSocket()
+            except OSError:
+                self._icmp_unavailable = True
+                return None
+            self._icmp_local.socket = icmp
+        return icmp
+
+    def _check_ping_icmp(
+        self, icmp: "_IcmpEchoSocket", host: str, address: str, timeout: int
+    ) -> CheckResult:
+        """Single ICMP echo through the thread's reusable socket"""
+        details = {"address": address}
+        response_time = icmp.ping(address, timeout)
+
+        if response_time is None:
+            message = f"Ping timeout after {timeout}s"
+            return CheckResult(False, timeout * 1000, message, None, details)
+
+        message = f"Ping successful ({response_time}ms)"
+        return CheckResult(True, response_time, message, None, details)
+
     def check_tcp(self, server_config, timeout: int) -> CheckResult:
         """TCP socket connection check"""
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
 
         try:
-            host = self.extract_hostname(server_config.host)
-            port = server_config.port or 80
+            cfg = self.normalize(server_config)
+            host = self.extract_hostname(cfg.host)
+            port = cfg.port or 80
 
-            # Create socket connection
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
+            # Connect to the first reachable (cached) resolved address
+            sock, result = self._connect_tcp(resolve(host, port), timeout)
 
             try:
-                result = sock.connect_ex((host, port))
-                response_time = int((time.time() - start_time) * 1000)
+                response_time = (time.monotonic_ns() - start_ns) // 1_000_000
 
                 if result == 0:
                     message = f"TCP connection successful to {host}:{port}"
                     details = {"host": host, "port": port}
 
                     # Try to send/receive data if specified
-                    if (
-                        hasattr(server_config, "tcp_send_data")
-                        and server_config.tcp_send_data
-                    ):
+                    if cfg.tcp_send_data is not None:
                         try:
-                            sock.send(server_config.tcp_send_data.encode())
-                            if hasattr(server_config, "tcp_expect_data"):
+                            sock.send(cfg.tcp_send_data.encode())
+                            if cfg.tcp_expect_data is not None:
                                 received = sock.recv(1024).decode(
                                     "utf-8", errors="ignore"
                                 )
-                                if server_config.tcp_expect_data not in received:
+                                if cfg.tcp_expect_data not in received:
                                     message = f"TCP data mismatch on {host}:{port}"
                                     return CheckResult(
                                         False, response_time, message, None, details
@@ -286,7 +738,8 @@ class HealthChecker:
                     return CheckResult(False, response_time, message, None, details)
 
             finally:
-                sock.close()
+                if sock is not None:
+                    sock.close()
 
         except socket.timeout:
             response_time = timeout * 1000
@@ -294,55 +747,62 @@ class HealthChecker:
             return CheckResult(False, response_time, message)
 
         except Exception as e:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
             message = f"TCP check failed: {str(e)}"
             details = {"error": str(e)}
 
             return CheckResult(False, response_time, message, None, details)
 
+    def _connect_tcp(self, addrinfo: list, timeout: int):
+        """Try each resolved address in turn, like socket.create_connection,
+        returning (socket, 0) on success or (None, last error code)"""
+        result = errno.EHOSTUNREACH
+        for family, socktype, proto, _, address in addrinfo:
+            sock = socket.socket(family, socktype, proto)
+            sock.settimeout(timeout)
+            # Flush optional tcp_send_data immediately instead of waiting on Nagle
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            result = sock.connect_ex(address)
+            if result == 0:
+                return sock, 0
+            sock.close()
+        return None, result
+
     def check_custom(self, server_config, timeout: int) -> CheckResult:
         """Custom health check using external command or script"""
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
 
         try:
-            if (
-                not hasattr(server_config, "custom_command")
-                or not server_config.custom_command
-            ):
+            cmd = self.normalize(server_config).custom_command
+            if not cmd:
                 return CheckResult(False, 0, "No custom command specified")
 
-            # Execute custom command
-            cmd = server_config.custom_command
-            if isinstance(cmd, str):
-                cmd = cmd.split()
+            # Execute custom command, keeping only the head of its output
+            returncode, stdout, stderr = _run_capped(cmd, timeout)
 
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=timeout, cwd=None, env=None
-            )
-
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
 
             # Check exit code
-            is_healthy = result.returncode == 0
+            is_healthy = returncode == 0
 
             # Get output
-            stdout = result.stdout.strip()
-            stderr = result.stderr.strip()
+            stdout = stdout.decode("utf-8", errors="replace").strip()
+            stderr = stderr.decode("utf-8", errors="replace").strip()
 
             if is_healthy:
                 message = f"Custom check passed"
                 if stdout:
                     message += f": {stdout[:100]}"
             else:
-                message = f"Custom check failed (exit {result.returncode})"
+                message = f"Custom check failed (exit {returncode})"
                 if stderr:
                     message += f": {stderr[:100]}"
 
             details = {
-                "exit_code": result.returncode,
+                "exit_code": returncode,
                 "stdout": stdout,
                 "stderr": stderr,
-                "command": " ".join(cmd) if isinstance(cmd, list) else cmd,
+                "command": " ".join(cmd),
             }
 
             return CheckResult(is_healthy, response_time, message, None, details)
@@ -353,7 +813,7 @@ class HealthChecker:
             return CheckResult(False, response_time, message)
 
         except Exception as e:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
             message = f"Custom check error: {str(e)}"
             details = {"error": str(e)}
 
@@ -361,64 +821,30 @@ class HealthChecker:
 
     def build_url(self, server_config) -> str:
         """Build URL from server configuration"""
-        host = server_config.host
-
-        # If it's already a full URL, use it
-        if "://" in host:
-            # Add custom endpoint if specified
-            if (
-                hasattr(server_config, "custom_endpoint")
-                and server_config.custom_endpoint
-            ):
-                if not host.endswith("/"):
-                    host += "/"
-                host += server_config.custom_endpoint.lstrip("/")
-            return host
-
-        # Build URL from components
-        port = server_config.port
-        # Use HTTPS for port 443 or any port ending in 443 (like 5443, 8443)
-        protocol = (
-            "https" if (port == 443 or (port and str(port).endswith("443"))) else "http"
-        )
-
-        if port and port not in [80, 443]:
-            url = f"{protocol}://{host}:{port}"
-        else:
-            url = f"{protocol}://{host}"
-
-        # Add custom endpoint
-        if hasattr(server_config, "custom_endpoint") and server_config.custom_endpoint:
-            if not url.endswith("/"):
-                url += "/"
-            url += server_config.custom_endpoint.lstrip("/")
-
-        return url
+        cfg = self.normalize(server_config)
+        return _build_url_cached(cfg.host, cfg.port, cfg.custom_endpoint)
 
     def extract_hostname(self, host: str) -> str:
         """Extract hostname from URL or host string"""
-        if "://" in host:
-            parsed = urllib.parse.urlparse(host)
-            return parsed.hostname or parsed.netloc.split(":")[0]
+        return _extract_hostname_cached(host)
 
-        # Remove port if present
-        if ":" in host:
-            return host.split(":")[0]
-
-        return host
+    def clear_caches(self):
+        """Drop cached URLs, hostnames and DNS results after a config reload"""
+        _build_url_cached.cache_clear()
+        _extract_hostname_cached.cache_clear()
+        clear_dns_cache()
+        self._normalized.clear()
 
     def extract_ping_time(self, ping_output: str) -> Optional[int]:
         """Extract ping time from ping command output"""
         try:
             # Look for time=XXXms pattern
-            time_match = re.search(
-                r"time[=<](\d+(?:\.\d+)?)\s*ms", ping_output, re.IGNORECASE
-            )
+            time_match = _PING_TIME_RE.search(ping_output)
             if time_match:
                 return int(float(time_match.group(1)))
 
             # Look for XXXms pattern
-            time_match = re.search(r"(\d+(?:\.\d+)?)\s*ms", ping_output)
+            time_match = _PING_MS_RE.search(ping_output)
             if time_match:
                 return int(float(time_match.group(1)))
 
@@ -428,50 +854,73 @@ class HealthChecker:
 
     def quick_http_check(self, url: str, timeout: int = 2) -> CheckResult:
         """Ultra-fast HTTP check using HEAD request only"""
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
 
         try:
-            req = urllib.request.Request(url)
-            req.get_method = lambda: "HEAD"  # HEAD request for maximum speed
-            req.add_header("User-Agent", "SatoMonitor/1.0")
-            req.add_header("Connection", "close")
-
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                response_time = int((time.time() - start_time) * 1000)
-                status_code = response.getcode()
-
-                # Simple success check
-                is_healthy = 200 <= status_code < 400
-                message = f"HTTP {status_code}"
+            # HEAD request for maximum speed over the pooled connection
+            response = self._session.head(
+                url,
+                timeout=timeout,
+                allow_redirects=True,
+            )
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
+            status_code = response.status_code
 
-                return CheckResult(
-                    is_healthy, response_time, message, status_code, {"method": "HEAD"}
-                )
+            # Simple success check
+            is_healthy = 200 <= status_code < 400
+            message = f"HTTP {status_code}"
 
-        except urllib.error.HTTPError as e:
-            response_time = int((time.time() - start_time) * 1000)
-            is_healthy = 200 <= e.code < 400
             return CheckResult(
-                is_healthy, response_time, f"HTTP {e.code}", e.code, {"method": "HEAD"}
+                is_healthy, response_time, message, status_code, {"method": "HEAD"}
             )
 
         except Exception:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_ns) // 1_000_000
             return CheckResult(False, response_time, "Failed", None, {"method": "HEAD"})
 
     def check_internet_connectivity(self) -> bool:
         """Quick internet connectivity check"""
+        # Callers in the same tick share one probe result
+        now = time.monotonic()
+        checked_at, connected = self._connectivity_cache
+        if now - checked_at < self.CONNECTIVITY_CACHE_TTL:
+            return connected
+
         try:
-            # Try to resolve a reliable DNS name
-            socket.gethostbyname("google.com")
-            return True
-        except:
-            try:
-                # Fallback: try to connect to a reliable service
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)  # Reduced timeout for faster check
-                result = sock.connect_ex(("8.8.8.8", 53))  # Google DNS
-                sock.close()
-                return result == 0
-            except:
-                return False
+            connected = asyncio.run(self._probe_internet(timeout=1))
+        except Exception:
+            connected = False
+
+        self._connectivity_cache = (time.monotonic(), connected)
+        return connected
+
+    async def _probe_internet(self, timeout: float) -> bool:
+        """Race a DNS lookup against direct DNS-server connects; any success wins"""
+        loop = asyncio.get_running_loop()
+
+        async def connect(host: str, port: int):
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+
+        probes = [
+            # Resolve on the check pool so a hung lookup cannot hold up
+            # asyncio.run()'s default-executor shutdown
+            loop.run_in_executor(
+                _check_executor, socket.getaddrinfo, "google.com", 443
+            ),
+            asyncio.ensure_future(connect("1.1.1.1", 53)),  # Cloudflare DNS
+            asyncio.ensure_future(connect("8.8.8.8", 53)),  # Google DNS
+        ]
+        try:
+            for probe in asyncio.as_completed(probes, timeout=timeout):
+                try:
+                    await probe
+                    return True
+                except OSError:
+                    continue
+            return False
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            for probe in probes:
+                probe.cancel()
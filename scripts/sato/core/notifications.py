@@ -3,14 +3,231 @@
 Notification System for Server Status Widget
 """
 
+import queue
+import shutil
 import subprocess
+import sys
 import threading
 import time
 import requests
-from typing import Optional, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, List, NamedTuple
 from pathlib import Path
-from dataclasses import dataclass
-from collections import defaultdict
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from collections import defaultdict, deque
+
+# Talk to the freedesktop notification daemon over D-Bus when GIO is available
+try:
+    from gi.repository import Gio, GLib
+
+    GIO_AVAILABLE = True
+except (ImportError, ValueError):
+    Gio = GLib = None
+    GIO_AVAILABLE = False
+
+
+class _StatusMeta(NamedTuple):
+    urgency: str
+    icon: str  # Single-event notifications
+    group_icon: str  # Grouped (batched) notifications
+    title: str  # .format(server_name)
+    group_title: str  # .format(count)
+    body: str
+    group_body: str  # .format(names)
+    detail: str  # "response_time" or "message" appended to a single body
+
+
+class _StatusChange(NamedTuple):
+    status: str
+    timestamp: float  # NotificationManager._now() clock
+
+
+# Notification wording per new status; unknown statuses read as degraded
+_STATUS_META = {
+    "operational": _StatusMeta(
+        "normal",
+        "✅",
+        "✅",
+        "Service Restored: {}",
+        "{} Services Restored",
+        "Service is operational",
+        "Services operational: {}",
+        "response_time",
+    ),
+    "down": _StatusMeta(
+        "critical",
+        "❌",
+        "🚨",
+        "Service Down: {}",
+        "{} Services Down",
+        "Service is not responding",
+        "Services not responding: {}",
+        "message",
+    ),
+    "degraded": _StatusMeta(
+        "normal",
+        "⚠️",
+        "⚠️",
+        "Service Issues: {}",
+        "{} Services Degraded",
+        "Service is experiencing issues",
+        "Services with issues: {}",
+        "message",
+    ),
+}
+
+
+def _status_meta(status: str) -> _StatusMeta:
+    """Notification wording for a status"""
+    return _STATUS_META.get(status, _STATUS_META["degraded"])
+
+
+def _single_body(meta: _StatusMeta, response_time: int, message: str) -> str:
+    """Body for a single-service notification"""
+    if meta.detail == "response_time":
+        return f"{meta.body} ({response_time}ms)" if response_time > 0 else meta.body
+    return f"{meta.body}\n{message}" if message else meta.body
+
+
+def _format_names(service_names: List[str]) -> str:
+    """Up to three names, or the first two and a count of the rest"""
+    count = len(service_names)
+    if count <= 3:
+        return ", ".join(service_names)
+    return f"{', '.join(service_names[:2])}, +{count-2} more"
+
+
+# Status strings stored in tracking dicts and events, interned so lookups
+# compare by identity
+_STATUS_NAMES = {
+    s: sys.intern(s) for s in ("operational", "down", "degraded", "checking", "unknown")
+}
+
+
+# Monitor-internal states that never warrant a notification
+_INTERNAL_STATES = frozenset({"checking", "initializing"})
+
+
+@lru_cache(maxsize=1024)
+def _response_time_text(response_time: int) -> str:
+    """Response time as shown in webhook messages"""
+    return "%dms" % response_time if response_time > 0 else "N/A"
+
+
+def _slack_attachment(
+    server_name: str,
+    old_status: str,
+    new_status: str,
+    response_time: int,
+    message: str,
+    ts: int,
+) -> dict:
+    """One Slack attachment for a status change"""
+    return {
+        "color": "good" if new_status == "operational" else "danger",
+        "title": "Server Status Change: " + server_name,
+        "fields": [
+            {
+                "title": "Status",
+                "value": "%s → %s" % (old_status, new_status),
+                "short": True,
+            },
+            {
+                "title": "Response Time",
+                "value": _response_time_text(response_time),
+                "short": True,
+            },
+        ],
+        "text": message or "",
+        "ts": ts,
+    }
+
+
+def _discord_embed(
+    server_name: str,
+    old_status: str,
+    new_status: str,
+    response_time: int,
+    message: str,
+    timestamp: str,
+) -> dict:
+    """One Discord embed for a status change"""
+    return {
+        "title": "Server Status Change: " + server_name,
+        "color": 0x00FF00 if new_status == "operational" else 0xFF0000,
+        "fields": [
+            {
+                "name": "Status",
+                "value": "%s → %s" % (old_status, new_status),
+                "inline": True,
+            },
+            {
+                "name": "Response Time",
+                "value": _response_time_text(response_time),
+                "inline": True,
+            },
+        ],
+        "description": message or "",
+        "timestamp": timestamp,
+    }
+
+
+_DBUS_URGENCY = {"low": 0, "normal": 1, "critical": 2}
+
+# Title and body are passed as arguments, never spliced into the script
+_OSASCRIPT_NOTIFY = (
+    "-e",
+    "on run argv",
+    "-e",
+    'display notification (item 1 of argv) with title (item 2 of argv) sound name "default"',
+    "-e",
+    "end run",
+)
+
+
+# Alert sounds per status, first existing file wins
+_SOUND_CANDIDATES = {
+    "operational": (
+        "/usr/share/sounds/freedesktop/stereo/complete.oga",
+        "/usr/share/sounds/alsa/Front_Left.wav",
+        "/System/Library/Sounds/Glass.aiff",
+    ),
+    "down": (
+        "/usr/share/sounds/freedesktop/stereo/dialog-error.oga",
+        "/usr/share/sounds/alsa/Front_Right.wav",
+        "/System/Library/Sounds/Basso.aiff",
+    ),
+    "degraded": (
+        "/usr/share/sounds/freedesktop/stereo/bell.oga",
+        "/System/Library/Sounds/Funk.aiff",
+    ),
+}
+
+
+def _spawn(cmd: List[str], wait: bool) -> bool:
+    """Start a notification/sound helper by absolute path with its output
+    discarded. Nothing is captured and close_fds stays off (our descriptors
+    are non-inheritable anyway), so CPython can use posix_spawn instead of
+    forking the whole monitor. Only waits for the exit status when asked"""
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=False,
+    )
+    return proc.wait() == 0 if wait else True
+
+
+def _ignore_status_change(*args, **kwargs):
+    """notify_status_change while status change notifications are off"""
+
+
+# Queued to tell the batch worker to flush what it holds and exit
+_CLOSE = object()
 
 
 @dataclass
@@ -24,71 +241,134 @@ class NotificationEvent:
 
 
 class NotificationManager:
+    FLAP_WINDOW = 600  # seconds of status changes considered for flapping
+    PRUNE_INTERVAL = 600  # seconds between sweeps of stale tracking entries
+
     def __init__(self, settings):
         self.settings = settings
+        # Clock for rate limiting, cooldown and flap detection (replaceable in tests)
+        self._now = time.monotonic
         self.last_notifications: Dict[str, float] = {}  # Prevent spam
         self.notification_cooldown = 60  # seconds
 
         # Enhanced notification features
-        self.pending_notifications: List[NotificationEvent] = []
-        self.notification_lock = threading.Lock()
-        self.batch_timer = None
         self.batch_delay = 5  # seconds to wait before sending grouped notification
+        self.batch_max_delay = 15  # longest a batch is held back by new events
+
+        # Callers only enqueue status changes; the single batch worker applies
+        # the smart rules and owns the pending batch and the tracking below,
+        # so none of that state needs a lock
+        self._event_q: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.pending_notifications: List[NotificationEvent] = []
+        self._first_pending_at: Optional[float] = None
+        self._last_pending_at: Optional[float] = None
 
         # Smart rules tracking
         self.last_meaningful_status: Dict[str, str] = {}
-        self.status_change_history: Dict[str, List[Dict]] = defaultdict(list)
+        # Recent status changes per service, oldest first; more than 3 within
+        # 10 minutes counts as flapping, so a short bounded window suffices
+        self.status_change_history: Dict[str, "deque[_StatusChange]"] = defaultdict(
+            lambda: deque(maxlen=32)
+        )
+        self._flap_reported: set = set()  # Flapping services already logged
 
         # Cooldown tracking
         self.last_notification_time: Dict[str, float] = {}
         self.cooldown_period = getattr(settings, "alert_cooldown_seconds", 300)
+        self._last_prune = self._now()
+
+        # Shared worker threads for desktop, sound and webhook deliveries
+        self._executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "notification_workers", 4),
+            thread_name_prefix="notif",
+        )
+
+        # Keep-alive session so webhook POSTs reuse TCP/TLS connections
+        self._http = requests.Session()
+        self._http.headers["Content-Type"] = "application/json"
+        webhook_adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=100,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=None,  # Webhook POSTs are safe to resend
+            ),
+        )
+        self._http.mount("https://", webhook_adapter)
+        self._http.mount("http://", webhook_adapter)
+
+        # Resolve notification/sound backends once instead of per alert
+        self._dbus = self._connect_session_bus()
+        self._notify_send = shutil.which("notify-send")  # Linux
+        self._osascript = shutil.which("osascript")  # macOS
+        self._paplay = shutil.which("paplay")  # PulseAudio - Linux
+        self._afplay = shutil.which("afplay")  # macOS
+        self._sound_files: Dict[str, Optional[str]] = {}  # Resolved lazily
 
         # Check if notification system is available
         self.desktop_available = self.check_desktop_notifications()
         self.sound_available = self.check_sound_system()
 
-    def check_desktop_notifications(self) -> bool:
-        """Check if desktop notifications are available"""
-        try:
-            # Try notify-send (Linux)
-            result = subprocess.run(
-                ["which", "notify-send"], capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                return True
-
-            # Try osascript (macOS)
-            result = subprocess.run(
-                ["which", "osascript"], capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                return True
+        # Sends each batch once it has been quiet for batch_delay (or pending
+        # for batch_max_delay)
+        self._batch_thread = threading.Thread(
+            target=self._batch_worker, name="notif-batch", daemon=True
+        )
+        self._batch_thread.start()
 
-            return False
-        except:
-            return False
+        self.reconfigure()
 
-    def check_sound_system(self) -> bool:
-        """Check if sound system is available"""
+    def _connect_session_bus(self):
+        """Return the D-Bus session bus, or None if it cannot be reached"""
+        if not GIO_AVAILABLE:
+            return None
         try:
-            # Try paplay (PulseAudio - Linux)
-            result = subprocess.run(["which", "paplay"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return True
+            return Gio.bus_get_sync(Gio.BusType.SESSION, None)
+        except Exception:
+            return None
+
+    def _notify_dbus(self, title: str, body: str, urgency: str):
+        """Call org.freedesktop.Notifications.Notify directly"""
+        hints = {"urgency": GLib.Variant("y", _DBUS_URGENCY.get(urgency, 1))}
+        self._dbus.call_sync(
+            "org.freedesktop.Notifications",
+            "/org/freedesktop/Notifications",
+            "org.freedesktop.Notifications",
+            "Notify",
+            GLib.Variant(
+                "(susssasa{sv}i)",
+                (
+                    "Server Monitor",
+                    0,
+                    "",
+                    title,
+                    body,
+                    [],
+                    hints,
+                    self.settings.notification_timeout,
+                ),
+            ),
+            None,
+            Gio.DBusCallFlags.NONE,
+            -1,
+            None,
+        )
 
-            # Try afplay (macOS)
-            result = subprocess.run(["which", "afplay"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return True
+    def check_desktop_notifications(self) -> bool:
+        """Check if desktop notifications are available"""
+        return bool(self._dbus or self._notify_send or self._osascript)
 
-            return False
-        except:
-            return False
+    def check_sound_system(self) -> bool:
+        """Check if sound system is available"""
+        return bool(self._paplay or self._afplay)
 
     def should_notify(self, server_name: str, notification_type: str) -> bool:
         """Check if we should send a notification (rate limiting)"""
+        self._prune_tracking()
         key = f"{server_name}_{notification_type}"
-        current_time = time.time()
+        current_time = self._now()
 
         if key in self.last_notifications:
             if current_time - self.last_notifications[key] < self.notification_cooldown:
@@ -97,6 +377,27 @@ class NotificationManager:
         self.last_notifications[key] = current_time
         return True
 
+    def reconfigure(self, settings=None):
+        """Adopt new (or edited) settings and rebind notify_status_change to
+        the path they select, so it is not re-decided on every event"""
+        if settings is not None:
+            self.settings = settings
+
+        if not (self.settings.notify_on_status_change and self._any_channel_enabled()):
+            self.notify_status_change = _ignore_status_change
+        elif getattr(self.settings, "enhanced_notifications", True):
+            self.notify_status_change = self._notify_status_change_enhanced
+        else:
+            self.notify_status_change = self._notify_status_change_original
+
+    def _any_channel_enabled(self) -> bool:
+        """Whether any delivery channel is switched on"""
+        return bool(
+            self.settings.desktop_notifications
+            or self.settings.sound_alerts
+            or self.settings.webhook_url
+        )
+
     def notify_status_change(
         self,
         server_name: str,
@@ -129,33 +430,17 @@ class NotificationManager:
         message: str = "",
     ):
         """Enhanced notification with grouping and smart rules"""
-
-        # Apply smart rules first
-        if not self._should_notify_smart(server_name, old_status, new_status):
-            return
-
-        # Create notification event
-        event = NotificationEvent(
-            server_name=server_name,
-            old_status=old_status,
-            new_status=new_status,
-            timestamp=time.time(),
-            response_time=response_time,
-            message=message,
-        )
-
-        # Add to pending notifications for grouping
-        with self.notification_lock:
-            self.pending_notifications.append(event)
-
-            # Start or reset batch timer
-            if self.batch_timer:
-                self.batch_timer.cancel()
-
-            self.batch_timer = threading.Timer(
-                self.batch_delay, self._send_grouped_notifications
+        # Smart rules and grouping run on the batch worker
+        self._event_q.put(
+            NotificationEvent(
+                server_name=server_name,
+                old_status=_STATUS_NAMES.get(old_status, old_status),
+                new_status=_STATUS_NAMES.get(new_status, new_status),
+                timestamp=time.time(),
+                response_time=response_time,
+                message=message,
             )
-            self.batch_timer.start()
+        )
 
     def _notify_status_change_original(
         self,
@@ -166,35 +451,21 @@ class NotificationManager:
         message: str = "",
     ):
         """Original notification behavior"""
-        if not self.should_notify(server_name, "status_change"):
+        if not self._any_channel_enabled():
             return
 
-        # Determine notification urgency and icon
-        if new_status == "operational":
-            urgency = "normal"
-            icon = "✅"
-            title = f"Service Restored: {server_name}"
-            body = f"Service is now operational"
-            if response_time > 0:
-                body += f" ({response_time}ms)"
-        elif new_status == "down":
-            urgency = "critical"
-            icon = "❌"
-            title = f"Service Down: {server_name}"
-            body = f"Service is not responding"
-            if message:
-                body += f"\n{message}"
-        else:  # degraded
-            urgency = "normal"
-            icon = "⚠️"
-            title = f"Service Issues: {server_name}"
-            body = f"Service is experiencing issues"
-            if message:
-                body += f"\n{message}"
+        if not self.should_notify(server_name, "status_change"):
+            return
 
         # Send desktop notification
         if self.settings.desktop_notifications:
-            self.send_desktop_notification(title, body, urgency, icon)
+            meta = _status_meta(new_status)
+            self.send_desktop_notification(
+                meta.title.format(server_name),
+                _single_body(meta, response_time, message),
+                meta.urgency,
+                meta.icon,
+            )
 
         # Play sound alert
         if self.settings.sound_alerts:
@@ -214,18 +485,10 @@ class NotificationManager:
             return
 
         # Determine urgency and icon based on status
-        if status == "operational":
-            urgency = "normal"
-            icon = "✅"
-        elif status == "down":
-            urgency = "critical"
-            icon = "❌"
-        else:  # degraded
-            urgency = "normal"
-            icon = "⚠️"
+        meta = _status_meta(status)
 
         # Send desktop notification
-        self.send_desktop_notification(group_title, message, urgency, icon)
+        self.send_desktop_notification(group_title, message, meta.urgency, meta.icon)
 
         # Play sound alert for critical grouped alerts
         if status == "down" and self.settings.sound_alerts:
@@ -250,21 +513,34 @@ class NotificationManager:
             self.send_desktop_notification(title, body, "normal", "⏱️")
 
     def send_desktop_notification(
-        self, title: str, body: str, urgency: str = "normal", icon: str = ""
-    ):
-        """Send desktop notification"""
+        self,
+        title: str,
+        body: str,
+        urgency: str = "normal",
+        icon: str = "",
+        _sync: bool = False,
+    ) -> Optional[bool]:
+        """Send desktop notification; with _sync, send inline and return
+        whether it was delivered"""
         if not self.desktop_available:
-            return
+            return False if _sync else None
 
-        def send_notification():
+        def send_notification() -> bool:
             try:
+                # Linux (D-Bus), without forking notify-send
+                if self._dbus:
+                    try:
+                        self._notify_dbus(
+                            f"{icon} {title}" if icon else title, body, urgency
+                        )
+                        return True
+                    except Exception:
+                        pass  # No notification daemon; try notify-send
+
                 # Linux (notify-send)
-                result = subprocess.run(
-                    ["which", "notify-send"], capture_output=True, text=True
-                )
-                if result.returncode == 0:
+                if self._notify_send:
                     cmd = [
-                        "notify-send",
+                        self._notify_send,
                         "--urgency",
                         urgency,
                         "--expire-time",
@@ -274,72 +550,70 @@ class NotificationManager:
                         f"{icon} {title}" if icon else title,
                         body,
                     ]
-                    subprocess.run(cmd, capture_output=True)
-                    return
+                    return _spawn(cmd, wait=_sync)
 
                 # macOS (osascript)
-                result = subprocess.run(
-                    ["which", "osascript"], capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    script = f"""
-                    display notification "{body}" with title "{icon} {title}" sound name "default"
-                    """
-                    subprocess.run(["osascript", "-e", script], capture_output=True)
-                    return
+                if self._osascript:
+                    return _spawn(
+                        [self._osascript, *_OSASCRIPT_NOTIFY, body, f"{icon} {title}"],
+                        wait=_sync,
+                    )
 
             except Exception as e:
                 print(f"Error sending desktop notification: {e}")
+            return False
 
-        # Send notification in background thread
-        threading.Thread(target=send_notification, daemon=True).start()
+        if _sync:
+            return send_notification()
+
+        # Send notification on a background worker
+        self._executor.submit(send_notification)
+        return None
+
+    def _sound_file(self, status: str) -> Optional[str]:
+        """Sound file for a status, looked up once"""
+        if status not in self._sound_files:
+            self._sound_files[status] = next(
+                (
+                    path
+                    for path in _SOUND_CANDIDATES.get(status, ())
+                    if Path(path).exists()
+                ),
+                None,
+            )
+        return self._sound_files[status]
 
-    def play_sound_alert(self, status: str):
-        """Play sound alert based on status"""
+    def play_sound_alert(self, status: str, _sync: bool = False) -> Optional[bool]:
+        """Play sound alert based on status; with _sync, play inline and
+        return whether it played"""
         if not self.sound_available:
-            return
+            return False if _sync else None
 
-        def play_sound():
-            try:
-                # Determine sound file based on status
-                sound_file = None
-                if status == "operational":
-                    sound_file = (
-                        "/usr/share/sounds/alsa/Front_Left.wav"  # Success sound
-                    )
-                elif status == "down":
-                    sound_file = "/usr/share/sounds/alsa/Front_Right.wav"  # Error sound
-
-                if not sound_file or not Path(sound_file).exists():
-                    # Fallback to system beep
-                    subprocess.run(
-                        ["pactl", "upload-sample", "/dev/stdin", "beep"],
-                        input=b"\x07",
-                        capture_output=True,
-                    )
-                    return
+        # Nothing to play for this status on this system
+        sound_file = self._sound_file(status)
+        if not sound_file:
+            return False if _sync else None
 
+        def play_sound() -> bool:
+            try:
                 # Linux (paplay)
-                result = subprocess.run(
-                    ["which", "paplay"], capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    subprocess.run(["paplay", sound_file], capture_output=True)
-                    return
+                if self._paplay:
+                    return _spawn([self._paplay, sound_file], wait=_sync)
 
                 # macOS (afplay)
-                result = subprocess.run(
-                    ["which", "afplay"], capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    subprocess.run(["afplay", sound_file], capture_output=True)
-                    return
+                if self._afplay:
+                    return _spawn([self._afplay, sound_file], wait=_sync)
 
             except Exception as e:
                 print(f"Error playing sound alert: {e}")
+            return False
+
+        if _sync:
+            return play_sound()
 
-        # Play sound in background thread
-        threading.Thread(target=play_sound, daemon=True).start()
+        # Play sound on a background worker
+        self._executor.submit(play_sound)
+        return None
 
     def send_webhook_notification(
         self,
@@ -348,12 +622,14 @@ class NotificationManager:
         new_status: str,
         response_time: int,
         message: str,
-    ):
-        """Send webhook notification"""
+        _sync: bool = False,
+    ) -> Optional[int]:
+        """Send webhook notification; with _sync, post inline and return the
+        HTTP status code (None on failure)"""
         if not self.settings.webhook_url:
-            return
+            return None
 
-        def send_webhook():
+        def send_webhook() -> Optional[int]:
             try:
                 payload = {
                     "server_name": server_name,
@@ -374,19 +650,49 @@ class NotificationManager:
                         server_name, old_status, new_status, response_time, message
                     )
 
-                response = requests.post(
-                    self.settings.webhook_url,
-                    json=payload,
-                    timeout=10,
-                    headers={"Content-Type": "application/json"},
+                response = self._http.post(
+                    self.settings.webhook_url, json=payload, timeout=5 if _sync else 10
                 )
                 response.raise_for_status()
+                return response.status_code
 
             except Exception as e:
                 print(f"Error sending webhook notification: {e}")
+            return None
+
+        if _sync:
+            return send_webhook()
+
+        # Send webhook on a background worker
+        self._executor.submit(send_webhook)
+        return None
 
-        # Send webhook in background thread
-        threading.Thread(target=send_webhook, daemon=True).start()
+    def _send_webhook_batch(self, events: List[NotificationEvent]):
+        """Post a batch of events to the webhook in as few requests as possible"""
+        webhook_url = self.settings.webhook_url
+        if not webhook_url:
+            return
+
+        batch_size = max(1, getattr(self.settings, "webhook_batch_size", 100))
+        if "discord.com" in webhook_url:
+            batch_size = min(batch_size, 10)  # Discord allows 10 embeds per message
+
+        for start in range(0, len(events), batch_size):
+            batch = events[start : start + batch_size]
+            try:
+                # Format for Slack/Discord if URL contains those domains
+                if "slack.com" in webhook_url:
+                    payload = self.format_slack_batch(batch)
+                elif "discord.com" in webhook_url:
+                    payload = self.format_discord_batch(batch)
+                else:
+                    payload = {"events": [asdict(e) for e in batch]}
+
+                response = self._http.post(webhook_url, json=payload, timeout=10)
+                response.raise_for_status()
+
+            except Exception as e:
+                print(f"Error sending webhook notification: {e}")
 
     def format_slack_message(
         self,
@@ -397,30 +703,16 @@ class NotificationManager:
         message: str,
     ) -> dict:
         """Format message for Slack webhook"""
-        color = "good" if new_status == "operational" else "danger"
-
         return {
             "attachments": [
-                {
-                    "color": color,
-                    "title": f"Server Status Change: {server_name}",
-                    "fields": [
-                        {
-                            "title": "Status",
-                            "value": f"{old_status} → {new_status}",
-                            "short": True,
-                        },
-                        {
-                            "title": "Response Time",
-                            "value": (
-                                f"{response_time}ms" if response_time > 0 else "N/A"
-                            ),
-                            "short": True,
-                        },
-                    ],
-                    "text": message if message else "",
-                    "ts": int(time.time()),
-                }
+                _slack_attachment(
+                    server_name,
+                    old_status,
+                    new_status,
+                    response_time,
+                    message,
+                    int(time.time()),
+                )
             ]
         }
 
@@ -433,30 +725,50 @@ class NotificationManager:
         message: str,
     ) -> dict:
         """Format message for Discord webhook"""
-        color = 0x00FF00 if new_status == "operational" else 0xFF0000
+        return {
+            "embeds": [
+                _discord_embed(
+                    server_name,
+                    old_status,
+                    new_status,
+                    response_time,
+                    message,
+                    time.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                )
+            ]
+        }
 
+    def format_slack_batch(self, events: List[NotificationEvent]) -> dict:
+        """Format several events as one Slack webhook message"""
+        ts = int(time.time())
+        return {
+            "attachments": [
+                _slack_attachment(
+                    e.server_name,
+                    e.old_status,
+                    e.new_status,
+                    e.response_time,
+                    e.message,
+                    ts,
+                )
+                for e in events
+            ]
+        }
+
+    def format_discord_batch(self, events: List[NotificationEvent]) -> dict:
+        """Format several events as one Discord webhook message"""
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S.000Z")
         return {
             "embeds": [
-                {
-                    "title": f"Server Status Change: {server_name}",
-                    "color": color,
-                    "fields": [
-                        {
-                            "name": "Status",
-                            "value": f"{old_status} → {new_status}",
-                            "inline": True,
-                        },
-                        {
-                            "name": "Response Time",
-                            "value": (
-                                f"{response_time}ms" if response_time > 0 else "N/A"
-                            ),
-                            "inline": True,
-                        },
-                    ],
-                    "description": message if message else "",
-                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-                }
+                _discord_embed(
+                    e.server_name,
+                    e.old_status,
+                    e.new_status,
+                    e.response_time,
+                    e.message,
+                    timestamp,
+                )
+                for e in events
             ]
         }
 
@@ -464,28 +776,42 @@ class NotificationManager:
         """Test all notification methods"""
         print("Testing notification systems...")
 
+        # Each method runs inline so the printed result is the real outcome
         if self.desktop_available:
-            self.send_desktop_notification(
+            if self.send_desktop_notification(
                 "Server Monitor Test",
                 "Desktop notifications are working!",
                 "normal",
                 "🧪",
-            )
-            print("✅ Desktop notification sent")
+                _sync=True,
+            ):
+                print("✅ Desktop notification sent")
+            else:
+                print("❌ Desktop notification failed")
         else:
             print("❌ Desktop notifications not available")
 
         if self.sound_available and self.settings.sound_alerts:
-            self.play_sound_alert("operational")
-            print("✅ Sound alert played")
+            if self.play_sound_alert("operational", _sync=True):
+                print("✅ Sound alert played")
+            else:
+                print("❌ Sound alert failed")
         else:
             print("❌ Sound alerts not available or disabled")
 
         if self.settings.webhook_url:
-            self.send_webhook_notification(
-                "Test Server", "unknown", "operational", 123, "Test notification"
+            status_code = self.send_webhook_notification(
+                "Test Server",
+                "unknown",
+                "operational",
+                123,
+                "Test notification",
+                _sync=True,
             )
-            print("✅ Webhook notification sent")
+            if status_code is not None:
+                print(f"✅ Webhook notification sent (HTTP {status_code})")
+            else:
+                print("❌ Webhook notification failed")
         else:
             print("❌ Webhook not configured")
 
@@ -495,13 +821,14 @@ class NotificationManager:
         self, server_name: str, old_status: str, new_status: str
     ) -> bool:
         """Smart rules: only notify on meaningful changes"""
+        self._prune_tracking()
 
         # Rule 1: Skip if status didn't actually change
         if old_status == new_status:
             return False
 
-        # Rule 2: Skip "checking" status changes (internal state)
-        if old_status == "checking" or new_status == "checking":
+        # Rule 2: Skip changes to or from internal states
+        if old_status in _INTERNAL_STATES or new_status in _INTERNAL_STATES:
             return False
 
         # Rule 3: Check if this is a meaningful change
@@ -513,8 +840,14 @@ class NotificationManager:
 
         # Rule 4: Flap detection - too many changes recently
         if self._is_flapping(server_name, new_status):
-            print(f"🔄 Suppressing notification for flapping service: {server_name}")
+            # Say so once per flapping spell, not on every suppressed change
+            if server_name not in self._flap_reported:
+                self._flap_reported.add(server_name)
+                print(
+                    f"🔄 Suppressing notifications for flapping service: {server_name}"
+                )
             return False
+        self._flap_reported.discard(server_name)
 
         # Rule 5: Cooldown - don't spam same service
         if self._is_in_cooldown(server_name):
@@ -528,145 +861,206 @@ class NotificationManager:
 
     def _is_flapping(self, server_name: str, new_status: str) -> bool:
         """Detect if service is flapping (too many status changes)"""
-        current_time = time.time()
+        current_time = self._now()
         history = self.status_change_history[server_name]
 
         # Keep only last 10 minutes of history
-        history = [
-            change for change in history if current_time - change["timestamp"] < 600
-        ]
-        self.status_change_history[server_name] = history
+        while history and current_time - history[0].timestamp >= self.FLAP_WINDOW:
+            history.popleft()
 
         # If more than 3 changes in 10 minutes, consider flapping
         return len(history) > 3
 
+    def _prune_tracking(self):
+        """Periodically drop rate-limit, cooldown and flap entries that have
+        expired, so services that disappear do not accumulate forever"""
+        now = self._now()
+        if now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+
+        horizon = max(self.notification_cooldown, self.cooldown_period)
+        for tracking in (self.last_notifications, self.last_notification_time):
+            for key, last_time in list(tracking.items()):
+                if now - last_time >= horizon:
+                    tracking.pop(key, None)
+
+        for name, history in list(self.status_change_history.items()):
+            if not history or now - history[-1].timestamp >= self.FLAP_WINDOW:
+                self.status_change_history.pop(name, None)
+        self._flap_reported.intersection_update(self.status_change_history)
+
     def _is_in_cooldown(self, server_name: str) -> bool:
         """Check if service is in notification cooldown"""
-        last_time = self.last_notification_time.get(server_name, 0)
-        return time.time() - last_time < self.cooldown_period
+        last_time = self.last_notification_time.get(server_name)
+        if last_time is None:
+            return False
+        return self._now() - last_time < self.cooldown_period
 
     def _record_status_change(self, server_name: str, new_status: str):
         """Record status change for flap detection"""
-        current_time = time.time()
+        current_time = self._now()
         self.status_change_history[server_name].append(
-            {"status": new_status, "timestamp": current_time}
+            _StatusChange(new_status, current_time)
         )
         self.last_notification_time[server_name] = current_time
 
-    def _send_grouped_notifications(self):
-        """Send grouped notifications for batched events"""
-        with self.notification_lock:
-            if not self.pending_notifications:
-                return
-
-            events = self.pending_notifications.copy()
-            self.pending_notifications.clear()
-
-        # Group events by type
-        failures = [e for e in events if e.new_status == "down"]
-        recoveries = [e for e in events if e.new_status == "operational"]
-        degraded = [e for e in events if e.new_status == "degraded"]
+    def _batch_remaining(self) -> Optional[float]:
+        """Seconds until the pending batch is due, None if nothing is pending"""
+        if self._first_pending_at is None:
+            return None
+        deadline = min(
+            self._last_pending_at + self.batch_delay,
+            self._first_pending_at + self.batch_max_delay,
+        )
+        return deadline - time.monotonic()
 
-        # Send grouped notifications
-        if failures:
-            self._send_failure_group_notification(failures)
+    def _accept_event(self, event: NotificationEvent):
+        """Add an event to the pending batch if the smart rules allow it"""
+        if not self._should_notify_smart(
+            event.server_name, event.old_status, event.new_status
+        ):
+            return
 
-        if recoveries:
-            self._send_recovery_group_notification(recoveries)
+        self.pending_notifications.append(event)
 
-        if degraded:
-            self._send_degraded_group_notification(degraded)
+        # Push back the batch deadline
+        now = time.monotonic()
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+        self._last_pending_at = now
 
-    def _send_failure_group_notification(self, failures: List[NotificationEvent]):
-        """Send grouped notification for service failures"""
-        count = len(failures)
+    def _batch_worker(self):
+        """Drain queued events and send grouped notifications whenever the
+        pending batch falls due"""
+        while True:
+            remaining = self._batch_remaining()
+            try:
+                if remaining is not None and remaining <= 0:
+                    # Due: let events already queued join this batch first
+                    item = self._event_q.get_nowait()
+                else:
+                    item = self._event_q.get(timeout=remaining)
+            except queue.Empty:
+                if remaining is not None:
+                    try:
+                        self._send_grouped_notifications()
+                    except Exception as e:
+                        print(f"Error sending grouped notifications: {e}")
+                continue
+
+            # One bad event must not end the only thread that sends
+            # notifications, nor leave a flush or stats caller waiting
+            try:
+                if isinstance(item, NotificationEvent):
+                    self._accept_event(item)
+                elif item is _CLOSE:
+                    self._send_grouped_notifications()
+                elif isinstance(item, Future):
+                    # Stats request from get_notification_stats
+                    item.set_result(self._collect_stats())
+                else:
+                    # Flush request from force_send_pending
+                    self._send_grouped_notifications()
+            except Exception as e:
+                print(f"Error in notification worker: {e}")
+                if isinstance(item, Future) and not item.done():
+                    item.set_exception(e)
+            finally:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+            if item is _CLOSE:
+                return
 
-        if count == 1:
-            # Single failure
-            event = failures[0]
-            title = f"🚨 Service Down: {event.server_name}"
-            body = f"Service is not responding"
-            if event.message:
-                body += f"\n{event.message}"
-        else:
-            # Multiple failures
-            service_names = [e.server_name for e in failures]
-            if count <= 3:
-                names_str = ", ".join(service_names)
-            else:
-                names_str = f"{', '.join(service_names[:2])}, +{count-2} more"
+    def _send_grouped_notifications(self):
+        """Send grouped notifications for batched events"""
+        self._first_pending_at = None
+        self._last_pending_at = None
+        if not self.pending_notifications:
+            return
 
-            title = f"🚨 {count} Services Down"
-            body = f"Services not responding: {names_str}"
+        events = self.pending_notifications
+        self.pending_notifications = []
 
-        # Send notification
-        if self.settings.desktop_notifications:
-            self.send_desktop_notification(title, body, "critical", "🚨")
+        # Group events by type; failures first
+        for status in ("down", "operational", "degraded"):
+            group = [e for e in events if e.new_status == status]
+            if group:
+                self._send_status_group_notification(status, group)
 
-        # Play sound for failures
-        if self.settings.sound_alerts:
-            self.play_sound_alert("down")
-
-    def _send_recovery_group_notification(self, recoveries: List[NotificationEvent]):
-        """Send grouped notification for service recoveries"""
-        count = len(recoveries)
-
-        if count == 1:
-            # Single recovery
-            event = recoveries[0]
-            title = f"✅ Service Restored: {event.server_name}"
-            body = f"Service is operational"
-            if event.response_time > 0:
-                body += f" ({event.response_time}ms)"
-        else:
-            # Multiple recoveries
-            service_names = [e.server_name for e in recoveries]
-            if count <= 3:
-                names_str = ", ".join(service_names)
-            else:
-                names_str = f"{', '.join(service_names[:2])}, +{count-2} more"
+        # One webhook request per batch instead of one per event
+        if self.settings.webhook_url:
+            self._executor.submit(self._send_webhook_batch, events)
 
-            title = f"✅ {count} Services Restored"
-            body = f"Services operational: {names_str}"
+    def _send_status_group_notification(
+        self, status: str, events: List[NotificationEvent]
+    ):
+        """Send one grouped notification for events sharing a new status"""
+        meta = _STATUS_META[status]
 
         # Send notification
         if self.settings.desktop_notifications:
-            self.send_desktop_notification(title, body, "normal", "✅")
-
-    def _send_degraded_group_notification(self, degraded: List[NotificationEvent]):
-        """Send grouped notification for degraded services"""
-        count = len(degraded)
-
-        if count == 1:
-            # Single degraded service
-            event = degraded[0]
-            title = f"⚠️ Service Issues: {event.server_name}"
-            body = f"Service experiencing issues"
-            if event.message:
-                body += f"\n{event.message}"
-        else:
-            # Multiple degraded services
-            service_names = [e.server_name for e in degraded]
-            if count <= 3:
-                names_str = ", ".join(service_names)
+            count = len(events)
+            if count == 1:
+                # Single service
+                event = events[0]
+                title = f"{meta.group_icon} {meta.title.format(event.server_name)}"
+                body = _single_body(meta, event.response_time, event.message)
             else:
-                names_str = f"{', '.join(service_names[:2])}, +{count-2} more"
+                # Multiple services
+                names_str = _format_names([e.server_name for e in events])
+                title = f"{meta.group_icon} {meta.group_title.format(count)}"
+                body = meta.group_body.format(names_str)
 
-            title = f"⚠️ {count} Services Degraded"
-            body = f"Services with issues: {names_str}"
+            self.send_desktop_notification(title, body, meta.urgency, meta.group_icon)
 
-        # Send notification
-        if self.settings.desktop_notifications:
-            self.send_desktop_notification(title, body, "normal", "⚠️")
+        # Play sound for failures
+        if status == "down" and self.settings.sound_alerts:
+            self.play_sound_alert("down")
 
     def force_send_pending(self):
-        """Force send any pending notifications (for shutdown)"""
-        if self.batch_timer:
-            self.batch_timer.cancel()
-        self._send_grouped_notifications()
+        """Send everything queued so far without waiting for the batch delay"""
+        if not self._batch_thread.is_alive():
+            self._send_grouped_notifications()
+            return
+
+        # Queued behind earlier events, so the worker has accepted them first
+        flushed = threading.Event()
+        self._event_q.put(flushed)
+        # Stop waiting if the worker exits (close()) before reaching it
+        while not flushed.wait(0.5):
+            if not self._batch_thread.is_alive():
+                return
+
+    def close(self):
+        """Flush pending notifications and release the worker threads"""
+        if self._batch_thread.is_alive():
+            self._event_q.put(_CLOSE)
+            self._batch_thread.join()
+        self._executor.shutdown(wait=False)
+        self._http.close()
 
     def get_notification_stats(self) -> Dict:
         """Get statistics about notification behavior"""
+        if not self._batch_thread.is_alive():
+            return self._collect_stats()
+
+        # The worker owns the tracking dicts, so it builds the snapshot,
+        # after the events queued before this call
+        stats = Future()
+        self._event_q.put(stats)
+        # Stop waiting if the worker exits (close()) before reaching it
+        while True:
+            try:
+                return stats.result(timeout=0.5)
+            except FutureTimeoutError:
+                if not self._batch_thread.is_alive():
+                    return self._collect_stats()
+
+    def _collect_stats(self) -> Dict:
+        """Statistics from the tracking state (batch worker only)"""
+        current_time = self._now()
         return {
             "pending_count": len(self.pending_notifications),
             "tracked_services": len(self.last_meaningful_status),
@@ -678,6 +1072,6 @@ class NotificationManager:
             "cooldown_services": [
                 name
                 for name, last_time in self.last_notification_time.items()
-                if time.time() - last_time < self.cooldown_period
+                if current_time - last_time < self.cooldown_period
             ],
         }
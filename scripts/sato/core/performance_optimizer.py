@@ -3,126 +3,211 @@
 Performance Optimizer for Sato Enhanced Monitoring System
 """
 
+import asyncio
+import errno
+import http.client
+import json
+import os
+import socket
+import subprocess
 import time
 import threading
-from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import urllib.parse
+from typing import Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
 import queue
 
+from .health_checker import CHECK_POOL_SIZE, CheckResult, check_executor, resolve
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection to a server listening on a unix socket"""
+
+    def __init__(self, socket_path: str, timeout: float = 5):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def _docker_socket_path() -> Optional[str]:
+    """Unix socket the docker CLI would use, None if DOCKER_HOST points
+    elsewhere or the socket is missing"""
+    host = os.environ.get("DOCKER_HOST") or f"unix://{DOCKER_SOCKET}"
+    if not host.startswith("unix://"):
+        return None
+    path = host[len("unix://") :]
+    return path if os.path.exists(path) else None
+
+
+def _raise_first_error(tasks):
+    """Re-raise the first exception (a failing result callback) among
+    finished tasks, retrieving all of them so none is reported as lost"""
+    errors = [task.exception() for task in tasks]
+    for error in errors:
+        if error is not None:
+            raise error
+
 
 class PerformanceOptimizer:
     """Optimizes monitoring performance through various techniques"""
 
+    # Enough queued work to keep the shared check pool busy
+    MAX_OUTSTANDING_CHECKS = CHECK_POOL_SIZE * 2
+
     def __init__(self, max_workers: int = 5):
+        # Checks run on the health checker's shared pool, so they are not
+        # capped at max_workers; kept for existing callers
         self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.check_cache = {}
-        self.cache_ttl = 5  # seconds (reduced for more responsive updates)
-        self.last_cleanup = time.time()
+        # key -> (result, expires_at in time.monotonic() seconds), oldest first
+        self.check_cache: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        # Results are reused for response_time / 200 seconds within these
+        # bounds, so slow checks are repeated less often than fast ones
+        self.min_cache_ttl = 2.0  # seconds
+        self.max_cache_ttl = 30.0  # seconds
+        self.max_cache_entries = 1024
+        self._cache_lock = threading.Lock()
+        # Checks currently running, so concurrent requests share one probe
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        # Kept open across polls; only the monitor thread uses it
+        self._docker_conn: Optional[_UnixHTTPConnection] = None
 
     def parallel_health_checks(self, servers, health_checker, timeout=5):
         """Perform health checks in parallel with immediate result processing"""
         results = {}
-        futures = {}
-
-        # Submit all checks to thread pool
-        for i, server in enumerate(servers):
-            if getattr(server, "enabled", True):
-                future = self.executor.submit(
-                    self._cached_health_check, health_checker, server, timeout
-                )
-                futures[future] = i
-
-        # Collect results as they complete (no timeout - get results immediately)
-        for future in as_completed(futures):
-            server_index = futures[future]
-            try:
-                results[server_index] = future.result()
-            except Exception as e:
-                # Create error result
-                from .health_checker import CheckResult
-
-                results[server_index] = CheckResult(False, 0, f"Check failed: {str(e)}")
-
+        self._run_checks(servers, health_checker, timeout, results.__setitem__)
         return results
 
     def parallel_health_checks_streaming(
         self, servers, health_checker, result_callback, timeout=5
     ):
         """Perform health checks in parallel with streaming results (immediate updates)"""
-        futures = {}
+        self._run_checks(servers, health_checker, timeout, result_callback)
 
-        # Submit all checks to thread pool
-        for i, server in enumerate(servers):
-            if getattr(server, "enabled", True):
-                future = self.executor.submit(
-                    self._cached_health_check, health_checker, server, timeout
-                )
-                futures[future] = i
+    def _run_checks(self, servers, health_checker, timeout, on_result):
+        """Run cached checks of all enabled servers from one asyncio loop,
+        calling on_result(index, result) as each finishes. Only
+        MAX_OUTSTANDING_CHECKS are in flight at once, so memory stays flat
+        however large the fleet"""
 
-        # Process results as they complete immediately
-        for future in as_completed(futures):
-            server_index = futures[future]
+        async def check_one(loop, index, server):
             try:
-                result = future.result()
-                # Call callback immediately when result is ready
-                result_callback(server_index, result)
+                result = await loop.run_in_executor(
+                    check_executor(),
+                    self._cached_health_check,
+                    health_checker,
+                    server,
+                    timeout,
+                )
             except Exception as e:
-                # Create error result and call callback
-                from .health_checker import CheckResult
+                # Create error result
+                result = CheckResult(False, 0, f"Check failed: {str(e)}")
+            on_result(index, result)
+
+        async def check_all():
+            loop = asyncio.get_running_loop()
+            pending = set()
+            for index, server in enumerate(servers):
+                if not getattr(server, "enabled", True):
+                    continue
+                if len(pending) >= self.MAX_OUTSTANDING_CHECKS:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    _raise_first_error(done)
+                pending.add(loop.create_task(check_one(loop, index, server)))
+
+            if pending:
+                done, _ = await asyncio.wait(pending)
+                _raise_first_error(done)
 
-                error_result = CheckResult(False, 0, f"Check failed: {str(e)}")
-                result_callback(server_index, error_result)
+        asyncio.run(check_all())
 
     def _cached_health_check(self, health_checker, server, timeout):
         """Health check with caching for frequently checked services"""
-        cache_key = f"{server.name}_{server.host}"
-        current_time = time.time()
+        cache_key = (server.name, server.host)
 
-        # Check cache first
-        if cache_key in self.check_cache:
-            cached_result, cached_time = self.check_cache[cache_key]
-            if current_time - cached_time < self.cache_ttl:
-                return cached_result
+        with self._cache_lock:
+            current_time = time.monotonic()
+            self._evict_expired(current_time)
+
+            # Check cache first
+            cached = self.check_cache.get(cache_key)
+            if cached is not None and current_time < cached[1]:
+                return cached[0]
+
+            # Wait for a check of the same server that is already running
+            pending = self._in_flight.get(cache_key)
+            if pending is None:
+                future = self._in_flight[cache_key] = Future()
+
+        if pending is not None:
+            return pending.result()
 
         # Perform actual check
-        result = health_checker.check_server(server, timeout)
+        try:
+            result = health_checker.check_server(server, timeout)
+        except BaseException as e:
+            with self._cache_lock:
+                del self._in_flight[cache_key]
+            future.set_exception(e)
+            raise
 
         # Cache the result
-        self.check_cache[cache_key] = (result, current_time)
-
-        # Cleanup old cache entries periodically
-        if current_time - self.last_cleanup > 60:  # Every minute
-            self._cleanup_cache()
-            self.last_cleanup = current_time
+        with self._cache_lock:
+            self.check_cache[cache_key] = (
+                result,
+                time.monotonic() + self._result_ttl(result),
+            )
+            self.check_cache.move_to_end(cache_key)
+            while len(self.check_cache) > self.max_cache_entries:
+                self.check_cache.popitem(last=False)
+            del self._in_flight[cache_key]
+        future.set_result(result)
 
         return result
 
-    def _cleanup_cache(self):
-        """Remove expired cache entries"""
-        current_time = time.time()
-        expired_keys = [
-            key
-            for key, (_, cached_time) in self.check_cache.items()
-            if current_time - cached_time > self.cache_ttl * 2
-        ]
-
-        for key in expired_keys:
-            del self.check_cache[key]
+    def _result_ttl(self, result) -> float:
+        """Seconds to reuse a result; failures only briefly, so recoveries
+        show up quickly; a cache_ttl set by the check itself wins"""
+        ttl = getattr(result, "cache_ttl", None)
+        if ttl is not None:
+            return ttl
+        if not result.is_healthy:
+            return self.min_cache_ttl
+        return min(
+            max(result.response_time / 200.0, self.min_cache_ttl), self.max_cache_ttl
+        )
+
+    def _evict_expired(self, current_time):
+        """Drop expired entries from the front of the cache (call with the
+        lock held); expired entries further back are replaced on lookup"""
+        while self.check_cache:
+            _, expires_at = next(iter(self.check_cache.values()))
+            if current_time < expires_at:
+                break
+            self.check_cache.popitem(last=False)
 
     def optimize_check_intervals(self, servers):
         """Optimize check intervals based on service reliability"""
         for server in servers:
-            # Increase interval for consistently healthy services
-            if hasattr(server, "_consecutive_success"):
-                if server._consecutive_success > 10:
-                    # Increase interval for stable services
-                    server.check_interval = min(server.check_interval * 1.2, 60)
-                elif server._consecutive_success < 3:
-                    # Decrease interval for unstable services
-                    server.check_interval = max(server.check_interval * 0.8, 10)
-            else:
-                server._consecutive_success = 0
+            if server._consecutive_success > 10:
+                # Increase interval for stable services
+                server.check_interval = min(server.check_interval * 1.2, 60)
+            elif server._consecutive_success < 3:
+                # Decrease interval for unstable services
+                server.check_interval = max(server.check_interval * 0.8, 10)
 
     def batch_docker_checks(self, docker_services):
         """Batch Docker container checks for efficiency"""
@@ -130,43 +215,32 @@ class PerformanceOptimizer:
             return {}
 
         try:
-            import subprocess
-            from .health_checker import CheckResult
-
-            start_time = time.time()
+            start_time = time.monotonic()
 
-            # Single command to get all container statuses
-            result = subprocess.run(
-                ["docker", "ps", "-a", "--format", "{{.Names}}\t{{.Status}}"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            # Single request to get all container statuses
+            socket_path = _docker_socket_path()
+            if socket_path:
+                running = self._docker_api_running(socket_path)
+            else:
+                running = self._docker_cli_running()
 
-            if result.returncode != 0:
+            if running is None:
                 # Return error for all services
                 return {
-                    i: CheckResult(False, 0, "Docker command failed")
-                    for i, _ in enumerate(docker_services)
+                    service_index: CheckResult(False, 0, "Docker command failed")
+                    for service_index, _ in docker_services
                 }
 
-            # Parse results
-            container_status = {}
-            for line in result.stdout.strip().split("\n"):
-                if "\t" in line:
-                    name, status = line.split("\t", 1)
-                    container_status[name] = "Up" in status
-
             # Generate results for each service
             results = {}
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = int((time.monotonic() - start_time) * 1000)
 
             for i, (service_index, service) in enumerate(docker_services):
                 if hasattr(service, "containers"):
                     running_count = sum(
                         1
                         for container in service.containers
-                        if container_status.get(container.get("name", ""), False)
+                        if container.get("name", "") in running
                     )
                     total_count = len(service.containers)
 
@@ -202,10 +276,61 @@ class PerformanceOptimizer:
                 for service_index, _ in docker_services
             }
 
+    def _docker_api_running(self, socket_path: str) -> Set[str]:
+        """Names of running containers, from the Docker Engine API"""
+        # A kept-alive connection may have been dropped by the daemon, so a
+        # reused one gets one retry on a fresh connection
+        for reused in (self._docker_conn is not None, False):
+            if not reused:
+                self._docker_conn = _UnixHTTPConnection(socket_path, timeout=5)
+            conn = self._docker_conn
+            try:
+                conn.request("GET", "/containers/json?all=1")
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except ConnectionError:
+                conn.close()
+                self._docker_conn = None
+                if not reused:
+                    raise
+            except Exception:
+                conn.close()
+                self._docker_conn = None
+                raise
+
+        if response.status != 200:
+            raise RuntimeError(f"Docker API returned HTTP {response.status}")
+
+        return {
+            name.lstrip("/")
+            for container in json.loads(body)
+            if container.get("State") == "running"
+            for name in container.get("Names") or ()
+        }
+
+    def _docker_cli_running(self) -> Optional[Set[str]]:
+        """Names of running containers, from `docker ps`; None if it failed"""
+        result = subprocess.run(
+            ["docker", "ps", "--filter", "status=running", "--format", "{{.Names}}"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+
+        if result.returncode != 0:
+            return None
+
+        # The daemon already filtered to running containers, one name per line
+        return set(result.stdout.split())
+
     def shutdown(self):
         """Cleanup resources"""
-        self.executor.shutdown(wait=True)
-        self.check_cache.clear()
+        if self._docker_conn is not None:
+            self._docker_conn.close()
+            self._docker_conn = None
+        with self._cache_lock:
+            self.check_cache.clear()
 
 
 class FastHealthChecker:
@@ -213,53 +338,99 @@ class FastHealthChecker:
 
     def __init__(self):
         self.user_agent = "SatoMonitor/1.0"
-        self._session_cache = {}
+        self._http_headers = {
+            "User-Agent": self.user_agent,
+            "Cache-Control": "no-cache",
+        }
+        # Idle keep-alive connections per (scheme, host:port); a check takes
+        # the connection out while using it, so threads never share one
+        self._session_cache: Dict[Tuple[str, str], http.client.HTTPConnection] = {}
+        self._session_lock = threading.Lock()
 
     def quick_http_check(self, url, timeout=1.5):
         """Ultra-fast HTTP check with minimal overhead"""
-        import urllib.request
-        from .health_checker import CheckResult
-
-        start_time = time.time()
-
-        try:
-            # Use HEAD request for maximum speed
-            req = urllib.request.Request(url)
-            req.get_method = lambda: "HEAD"
-            req.add_header("User-Agent", self.user_agent)
-            req.add_header("Connection", "close")
-            req.add_header("Cache-Control", "no-cache")
+        start_time = time.monotonic()
+
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        with self._session_lock:
+            conn = self._session_cache.pop(key, None)
+
+        # A reused connection may have been closed by the server while idle,
+        # so it gets one retry on a fresh connection; a fresh one does not
+        for reused in (True, False) if conn is not None else (False,):
+            if not reused:
+                conn_class = (
+                    http.client.HTTPSConnection
+                    if parts.scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                conn = conn_class(parts.netloc, timeout=timeout)
+            elif conn.sock is not None:
+                conn.sock.settimeout(timeout)
 
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                response_time = int((time.time() - start_time) * 1000)
-                status_code = response.getcode()
+            try:
+                # Use HEAD request for maximum speed
+                conn.request("HEAD", path, headers=self._http_headers)
+                response = conn.getresponse()
+                response.read()
+                response_time = int((time.monotonic() - start_time) * 1000)
+                status_code = response.status
+
+                if response.will_close:
+                    conn.close()
+                else:
+                    with self._session_lock:
+                        idle = self._session_cache.setdefault(key, conn)
+                    if idle is not conn:
+                        conn.close()  # Another check already parked one
 
                 is_healthy = 200 <= status_code < 400
                 return CheckResult(is_healthy, response_time, f"HTTP {status_code}")
 
-        except urllib.request.HTTPError as e:
-            response_time = int((time.time() - start_time) * 1000)
-            is_healthy = 200 <= e.code < 400
-            return CheckResult(is_healthy, response_time, f"HTTP {e.code}")
+            except ConnectionError:  # Includes http.client.RemoteDisconnected
+                conn.close()
+                if reused:
+                    continue
+
+            except Exception:
+                conn.close()
+                break
+
+        response_time = int((time.monotonic() - start_time) * 1000)
+        return CheckResult(False, response_time, "Failed")
 
-        except Exception:
-            response_time = int((time.time() - start_time) * 1000)
-            return CheckResult(False, response_time, "Failed")
+    def close(self):
+        """Close idle keep-alive connections"""
+        with self._session_lock:
+            connections = list(self._session_cache.values())
+            self._session_cache.clear()
+        for conn in connections:
+            conn.close()
 
     def quick_tcp_check(self, host, port, timeout=2):
         """Fast TCP connection check"""
-        import socket
-        from .health_checker import CheckResult
-
-        start_time = time.time()
+        start_time = time.monotonic()
 
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            result = sock.connect_ex((host, port))
-            sock.close()
-
-            response_time = int((time.time() - start_time) * 1000)
+            # Try each resolved address in turn (IPv6 and IPv4), like
+            # socket.create_connection, keeping the connect_ex error code
+            result = errno.EHOSTUNREACH
+            for family, socktype, proto, _, address in resolve(host, port):
+                sock = socket.socket(family, socktype, proto)
+                sock.settimeout(timeout)
+                try:
+                    result = sock.connect_ex(address)
+                finally:
+                    sock.close()
+                if result == 0:
+                    break
+
+            response_time = int((time.monotonic() - start_time) * 1000)
 
             if result == 0:
                 return CheckResult(True, response_time, "TCP connection successful")
@@ -269,5 +440,5 @@ class FastHealthChecker:
                 )
 
         except Exception as e:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = int((time.monotonic() - start_time) * 1000)
             return CheckResult(False, response_time, str(e))
@@ -3,13 +3,14 @@
 Settings and Configuration Management for Sato Enhanced Monitoring System
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 
+from .config_io import atomic_write, json_dumps, read_json
+
 
 class CheckType(Enum):
     HTTP = "http"
@@ -18,6 +19,13 @@ class CheckType(Enum):
     CUSTOM = "custom"
 
 
+# Include common successful and expected API response codes; 401 is for
+# auth-required APIs
+DEFAULT_EXPECTED_STATUS_CODES = (200, 201, 202, 204, 301, 302, 304, 401)
+
+_CHECK_TYPES = {check_type.value: check_type for check_type in CheckType}
+
+
 class ThemeType(Enum):
     DARK = "dark"
     LIGHT = "light"
@@ -40,23 +48,35 @@ class ServerConfig:
     expected_status_codes: List[int] = None
     auto_restart: bool = True  # Enable auto-restart by default
     restart_command: Optional[str] = None  # Custom restart command
+    expected_content: Optional[str] = None  # Text the HTTP body must contain
+    custom_command: Optional[List[str]] = None  # Command for custom checks
 
     def __post_init__(self):
         if self.expected_status_codes is None:
-            # Include common successful and expected API response codes
-            self.expected_status_codes = [
-                200,
-                201,
-                202,
-                204,
-                301,
-                302,
-                304,
-                401,
-            ]  # Added 401 for auth-required APIs
+            self.expected_status_codes = list(DEFAULT_EXPECTED_STATUS_CODES)
         if isinstance(self.check_type, str):
             self.check_type = CheckType(self.check_type)
 
+        # Healthy checks in a row, tracked by the monitor (not saved)
+        self._consecutive_success = 0
+
+    def __setattr__(self, name, value):
+        # Reassigning a field invalidates the cached JSON form; private
+        # runtime state such as _consecutive_success does not
+        if not name.startswith("_"):
+            self.__dict__.pop("_json_dict", None)
+        object.__setattr__(self, name, value)
+
+    def to_json_dict(self) -> dict:
+        """Fields as JSON-ready values, cached until a field is reassigned
+        (lists are shared, so in-place edits still show up)"""
+        data = self.__dict__.get("_json_dict")
+        if data is None:
+            data = {f.name: getattr(self, f.name) for f in fields(self)}
+            data["check_type"] = self.check_type.value
+            self.__dict__["_json_dict"] = data
+        return data
+
 
 @dataclass
 class UISettings:
@@ -105,6 +125,8 @@ class NotificationSettings:
     enhanced_notifications: bool = (
         True  # Use enhanced notification system with grouping
     )
+    notification_workers: int = 4  # Background threads delivering alerts
+    webhook_batch_size: int = 100  # Max events per batched webhook request
 
 
 class SettingsManager:
@@ -112,13 +134,14 @@ class SettingsManager:
         if config_dir is None:
             config_dir = Path(__file__).parent
 
-        self.config_dir = Path(config_dir)
+        # Resolved once so later loads/saves don't depend on the cwd
+        self.config_dir = Path(config_dir).resolve()
         self.servers_file = self.config_dir / "config" / "config.json"
         self.settings_file = self.config_dir / "config" / "settings.json"
         self.history_file = self.config_dir / "history.json"
 
         # Ensure config directory exists
-        self.config_dir.mkdir(exist_ok=True)
+        self.servers_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Load settings
         self.servers: List[ServerConfig] = []
@@ -136,39 +159,23 @@ class SettingsManager:
     def load_servers(self) -> List[ServerConfig]:
         """Load server configurations from JSON file"""
         try:
-            if self.servers_file.exists():
-                with open(self.servers_file, "r") as f:
-                    data = json.load(f)
-                    servers = []
-                    for server_data in data:
-                        # Handle legacy config files - add missing fields with defaults
-                        if "check_type" not in server_data:
-                            server_data["check_type"] = CheckType.HTTP
-                        else:
-                            # Convert string check_type to enum
-                            check_type_str = server_data["check_type"]
-                            if isinstance(check_type_str, str):
-                                try:
-                                    server_data["check_type"] = CheckType(
-                                        check_type_str.lower()
-                                    )
-                                except ValueError:
-                                    server_data["check_type"] = CheckType.HTTP
-
-                        if "check_interval" not in server_data:
-                            server_data["check_interval"] = 15
-                        if "timeout" not in server_data:
-                            server_data["timeout"] = 5
-                        if "group" not in server_data:
-                            server_data["group"] = "Default"
-                        if "enabled" not in server_data:
-                            server_data["enabled"] = True
-
-                        servers.append(ServerConfig(**server_data))
-                    self.servers = servers
-            else:
-                self.servers = self.create_default_servers()
-                self.save_servers()
+            data = read_json(self.servers_file)
+            servers = []
+            for server_data in data:
+                # Handle legacy config files: fields they lack take the
+                # ServerConfig defaults; check_type may be any case or
+                # unknown (read as HTTP)
+                check_type = server_data.get("check_type")
+                if isinstance(check_type, str):
+                    server_data["check_type"] = _CHECK_TYPES.get(
+                        check_type.lower(), CheckType.HTTP
+                    )
+
+                servers.append(ServerConfig(**server_data))
+            self.servers = servers
+        except FileNotFoundError:
+            self.servers = self.create_default_servers()
+            self.save_servers()
         except Exception as e:
             print(f"Error loading servers: {e}")
             self.servers = self.create_default_servers()
@@ -178,34 +185,27 @@ class SettingsManager:
     def save_servers(self):
         """Save server configurations to JSON file"""
         try:
-            data = [asdict(server) for server in self.servers]
-            # Convert enums to strings for JSON serialization
-            for server_data in data:
-                if "check_type" in server_data:
-                    server_data["check_type"] = server_data["check_type"].value
+            data = [server.to_json_dict() for server in self.servers]
 
-            with open(self.servers_file, "w") as f:
-                json.dump(data, f, indent=2)
+            atomic_write(self.servers_file, json_dumps(data))
         except Exception as e:
             print(f"Error saving servers: {e}")
 
     def load_settings(self):
         """Load UI and monitoring settings"""
         try:
-            if self.settings_file.exists():
-                with open(self.settings_file, "r") as f:
-                    data = json.load(f)
-
-                    if "ui" in data:
-                        self.ui_settings = UISettings(**data["ui"])
-                    if "monitoring" in data:
-                        self.monitoring_settings = MonitoringSettings(
-                            **data["monitoring"]
-                        )
-                    if "notifications" in data:
-                        self.notification_settings = NotificationSettings(
-                            **data["notifications"]
-                        )
+            data = read_json(self.settings_file)
+
+            if "ui" in data:
+                self.ui_settings = UISettings(**data["ui"])
+            if "monitoring" in data:
+                self.monitoring_settings = MonitoringSettings(**data["monitoring"])
+            if "notifications" in data:
+                self.notification_settings = NotificationSettings(
+                    **data["notifications"]
+                )
+        except FileNotFoundError:
+            pass  # Defaults until settings are first saved
         except Exception as e:
             print(f"Error loading settings: {e}")
 
@@ -222,8 +222,7 @@ class SettingsManager:
             if "theme" in data["ui"]:
                 data["ui"]["theme"] = data["ui"]["theme"].value
 
-            with open(self.settings_file, "w") as f:
-                json.dump(data, f, indent=2)
+            atomic_write(self.settings_file, json_dumps(data))
         except Exception as e:
             print(f"Error saving settings: {e}")
 
@@ -265,6 +264,11 @@ class SettingsManager:
         self.servers = [s for s in self.servers if s.name != server_name]
         self.save_servers()
 
+    def remove_server_by_index(self, index: int):
+        """Remove the server configuration at a position in servers"""
+        del self.servers[index]
+        self.save_servers()
+
     def update_server(self, old_name: str, new_server: ServerConfig):
         """Update an existing server configuration"""
         for i, server in enumerate(self.servers):
@@ -273,6 +277,11 @@ class SettingsManager:
                 break
         self.save_servers()
 
+    def update_server_by_index(self, index: int, new_server: ServerConfig):
+        """Replace the server configuration at a position in servers"""
+        self.servers[index] = new_server
+        self.save_servers()
+
     def get_server_by_name(self, name: str) -> Optional[ServerConfig]:
         """Get a server configuration by name"""
         for server in self.servers:
@@ -3,12 +3,43 @@
 Settings Dialog for Enhanced Server Monitor
 """
 
+from pathlib import Path
+
 import gi
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GLib
+from gi.repository import Gdk, Gtk, GLib
+
+from .settings import CheckType, NotificationSettings, ServerConfig, ThemeType
+
+SERVER_EDIT_UI = Path(__file__).with_name("server_edit.ui")
+
+# Margins of the notebook pages and of the boxes inside their frames
+DIALOG_CSS = b"""
+.settings-page { margin: 20px; }
+.settings-section { margin: 10px 15px 15px 15px; }
+"""
+_dialog_css_installed = False
+
+# Servers list store columns read back by the dialog's handlers
+ENABLED_COLUMN = 5
+INDEX_COLUMN = 6
+
 
-from .settings import SettingsManager, ServerConfig, CheckType, ThemeType
+def install_dialog_css():
+    """Add the settings dialog stylesheet to the default screen once"""
+    global _dialog_css_installed
+    if _dialog_css_installed:
+        return
+
+    css_provider = Gtk.CssProvider()
+    css_provider.load_from_data(DIALOG_CSS)
+    Gtk.StyleContext.add_provider_for_screen(
+        Gdk.Screen.get_default(),
+        css_provider,
+        Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
+    )
+    _dialog_css_installed = True
 
 
 class SettingsDialog(Gtk.Dialog):
@@ -17,6 +48,11 @@ class SettingsDialog(Gtk.Dialog):
 
         self.settings_manager = settings_manager
         self.parent_window = parent
+        # Message dialogs by (message type, buttons), reused between prompts
+        self._message_dialogs = {}
+        # Timer of a deferred save_servers() after enabled toggles
+        self._save_servers_id = None
+        self.connect("destroy", self.on_destroy)
 
         # Dialog setup
         self.set_default_size(600, 500)
@@ -42,77 +78,125 @@ class SettingsDialog(Gtk.Dialog):
         content_area.set_margin_top(10)
         content_area.set_margin_bottom(10)
 
+        install_dialog_css()
+
         # Create notebook for tabs
         self.notebook = Gtk.Notebook()
         content_area.pack_start(self.notebook, True, True, 0)
 
-        # Create tabs
-        self.create_general_tab()
-        self.create_monitoring_tab()
-        self.create_notifications_tab()
-        self.create_servers_tab()
+        # Labels of the settings rows share one width so their fields line up
+        self.label_group = Gtk.SizeGroup(mode=Gtk.SizeGroupMode.HORIZONTAL)
+
+        # Create tabs; each one's widgets are only built when its page is
+        # first shown, so opening the dialog builds just the first tab
+        tabs = [
+            (
+                "General",
+                self.create_general_tab,
+                self.load_general_settings,
+                self.save_general_settings,
+            ),
+            (
+                "Monitoring",
+                self.create_monitoring_tab,
+                self.load_monitoring_settings,
+                self.save_monitoring_settings,
+            ),
+            (
+                "Notifications",
+                self.create_notifications_tab,
+                self.load_notification_settings,
+                self.save_notification_settings,
+            ),
+            # Server edits are saved as they are made
+            ("Servers", self.create_servers_tab, self.load_servers_list, None),
+        ]
 
-    def create_general_tab(self):
+        self._pending_tabs = {}  # page -> (build, load, save) until shown
+        self._built_tabs = {}  # page -> (load, save)
+        for label, build, load, save in tabs:
+            vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            vbox.get_style_context().add_class("settings-page")
+
+            page_num = self.notebook.append_page(vbox, Gtk.Label(label=label))
+            self._pending_tabs[page_num] = (build, load, save)
+
+        self._build_tab(self.notebook.get_current_page())
+        self.notebook.connect("switch-page", self.on_switch_page)
+
+    def _build_tab(self, page_num):
+        """Create the widgets of a tab that has not been shown yet; returns
+        whether anything was built"""
+        tab = self._pending_tabs.pop(page_num, None)
+        if tab is None:
+            return False
+
+        build, load, save = tab
+        page = self.notebook.get_nth_page(page_num)
+        build(page)
+        page.show_all()
+        self._built_tabs[page_num] = (load, save)
+        return True
+
+    def on_switch_page(self, notebook, page, page_num):
+        """Build and fill a tab the first time it is shown"""
+        if self._build_tab(page_num):
+            load, _ = self._built_tabs[page_num]
+            load()
+
+    def labeled_row(self, box, text, widget, expand=False):
+        """Add a row of a label and a field to box and return the field;
+        the field is right-aligned unless it expands to fill the row"""
+        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        label = Gtk.Label(label=text, xalign=0)
+        self.label_group.add_widget(label)
+
+        hbox.pack_start(label, False, False, 0)
+        if expand:
+            hbox.pack_start(widget, True, True, 0)
+        else:
+            hbox.pack_end(widget, False, False, 0)
+        box.pack_start(hbox, False, False, 0)
+        return widget
+
+    def add_section(self, vbox, title):
+        """Add a titled frame to a tab and return the box for its rows"""
+        frame = Gtk.Frame(label=title)
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        box.get_style_context().add_class("settings-section")
+        frame.add(box)
+        vbox.pack_start(frame, False, False, 0)
+        return box
+
+    def create_general_tab(self, vbox):
         """Create general settings tab"""
-        # Main container
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        vbox.set_margin_start(20)
-        vbox.set_margin_end(20)
-        vbox.set_margin_top(20)
-        vbox.set_margin_bottom(20)
+        vbox.set_spacing(15)
 
         # Theme settings
-        theme_frame = Gtk.Frame(label="Appearance")
-        theme_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        theme_box.set_margin_start(15)
-        theme_box.set_margin_end(15)
-        theme_box.set_margin_top(10)
-        theme_box.set_margin_bottom(15)
+        theme_box = self.add_section(vbox, "Appearance")
 
         # Theme selection
-        theme_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        theme_label = Gtk.Label(label="Theme:")
-        theme_label.set_halign(Gtk.Align.START)
-
         self.theme_combo = Gtk.ComboBoxText()
         self.theme_combo.append("dark", "Dark")
         self.theme_combo.append("light", "Light")
         self.theme_combo.append("auto", "Auto")
-
-        theme_hbox.pack_start(theme_label, False, False, 0)
-        theme_hbox.pack_end(self.theme_combo, False, False, 0)
-        theme_box.pack_start(theme_hbox, False, False, 0)
+        self.labeled_row(theme_box, "Theme:", self.theme_combo)
 
         # Opacity setting
-        opacity_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        opacity_label = Gtk.Label(label="Window Opacity:")
-        opacity_label.set_halign(Gtk.Align.START)
-
         self.opacity_scale = Gtk.Scale.new_with_range(
             Gtk.Orientation.HORIZONTAL, 0.5, 1.0, 0.05
         )
         self.opacity_scale.set_hexpand(True)
         self.opacity_scale.set_show_fill_level(True)
         self.opacity_scale.set_digits(2)
-
-        opacity_hbox.pack_start(opacity_label, False, False, 0)
-        opacity_hbox.pack_start(self.opacity_scale, True, True, 0)
-        theme_box.pack_start(opacity_hbox, False, False, 0)
+        self.labeled_row(theme_box, "Window Opacity:", self.opacity_scale, expand=True)
 
         # Animation setting
         self.animation_check = Gtk.CheckButton(label="Enable animations")
         theme_box.pack_start(self.animation_check, False, False, 0)
 
-        theme_frame.add(theme_box)
-        vbox.pack_start(theme_frame, False, False, 0)
-
         # Window behavior
-        behavior_frame = Gtk.Frame(label="Window Behavior")
-        behavior_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        behavior_box.set_margin_start(15)
-        behavior_box.set_margin_end(15)
-        behavior_box.set_margin_top(10)
-        behavior_box.set_margin_bottom(15)
+        behavior_box = self.add_section(vbox, "Window Behavior")
 
         self.always_on_top_check = Gtk.CheckButton(label="Always on top")
         self.minimize_to_tray_check = Gtk.CheckButton(label="Minimize to system tray")
@@ -122,132 +206,67 @@ class SettingsDialog(Gtk.Dialog):
         behavior_box.pack_start(self.minimize_to_tray_check, False, False, 0)
         behavior_box.pack_start(self.auto_hide_check, False, False, 0)
 
-        behavior_frame.add(behavior_box)
-        vbox.pack_start(behavior_frame, False, False, 0)
-
-        # Add to notebook
-        self.notebook.append_page(vbox, Gtk.Label(label="General"))
-
-    def create_monitoring_tab(self):
+    def create_monitoring_tab(self, vbox):
         """Create monitoring settings tab"""
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        vbox.set_margin_start(20)
-        vbox.set_margin_end(20)
-        vbox.set_margin_top(20)
-        vbox.set_margin_bottom(20)
+        vbox.set_spacing(15)
 
         # Global settings
-        global_frame = Gtk.Frame(label="Global Monitoring Settings")
-        global_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        global_box.set_margin_start(15)
-        global_box.set_margin_end(15)
-        global_box.set_margin_top(10)
-        global_box.set_margin_bottom(15)
+        global_box = self.add_section(vbox, "Global Monitoring Settings")
 
         # Check interval
-        interval_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        interval_label = Gtk.Label(label="Default check interval (seconds):")
-        interval_label.set_halign(Gtk.Align.START)
-
-        self.interval_spin = Gtk.SpinButton.new_with_range(5, 300, 5)
-
-        interval_hbox.pack_start(interval_label, False, False, 0)
-        interval_hbox.pack_end(self.interval_spin, False, False, 0)
-        global_box.pack_start(interval_hbox, False, False, 0)
+        self.interval_spin = self.labeled_row(
+            global_box,
+            "Default check interval (seconds):",
+            Gtk.SpinButton.new_with_range(5, 300, 5),
+        )
 
         # Parallel checks
         self.parallel_checks = Gtk.CheckButton(label="Enable parallel checking")
         global_box.pack_start(self.parallel_checks, False, False, 0)
 
         # Max concurrent
-        concurrent_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        concurrent_label = Gtk.Label(label="Max concurrent checks:")
-        concurrent_label.set_halign(Gtk.Align.START)
-
-        self.concurrent_spin = Gtk.SpinButton.new_with_range(1, 20, 1)
-
-        concurrent_hbox.pack_start(concurrent_label, False, False, 0)
-        concurrent_hbox.pack_end(self.concurrent_spin, False, False, 0)
-        global_box.pack_start(concurrent_hbox, False, False, 0)
-
-        global_frame.add(global_box)
-        vbox.pack_start(global_frame, False, False, 0)
+        self.concurrent_spin = self.labeled_row(
+            global_box,
+            "Max concurrent checks:",
+            Gtk.SpinButton.new_with_range(1, 20, 1),
+        )
 
         # Thresholds
-        threshold_frame = Gtk.Frame(label="Response Time Thresholds")
-        threshold_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        threshold_box.set_margin_start(15)
-        threshold_box.set_margin_end(15)
-        threshold_box.set_margin_top(10)
-        threshold_box.set_margin_bottom(15)
+        threshold_box = self.add_section(vbox, "Response Time Thresholds")
 
         # Warning threshold
-        warning_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        warning_label = Gtk.Label(label="Warning threshold (ms):")
-        warning_label.set_halign(Gtk.Align.START)
-
-        self.warning_spin = Gtk.SpinButton.new_with_range(100, 10000, 100)
-
-        warning_hbox.pack_start(warning_label, False, False, 0)
-        warning_hbox.pack_end(self.warning_spin, False, False, 0)
-        threshold_box.pack_start(warning_hbox, False, False, 0)
+        self.warning_spin = self.labeled_row(
+            threshold_box,
+            "Warning threshold (ms):",
+            Gtk.SpinButton.new_with_range(100, 10000, 100),
+        )
 
         # Critical threshold
-        critical_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        critical_label = Gtk.Label(label="Critical threshold (ms):")
-        critical_label.set_halign(Gtk.Align.START)
-
-        self.critical_spin = Gtk.SpinButton.new_with_range(500, 30000, 500)
-
-        critical_hbox.pack_start(critical_label, False, False, 0)
-        critical_hbox.pack_end(self.critical_spin, False, False, 0)
-        threshold_box.pack_start(critical_hbox, False, False, 0)
-
-        threshold_frame.add(threshold_box)
-        vbox.pack_start(threshold_frame, False, False, 0)
+        self.critical_spin = self.labeled_row(
+            threshold_box,
+            "Critical threshold (ms):",
+            Gtk.SpinButton.new_with_range(500, 30000, 500),
+        )
 
         # History settings
-        history_frame = Gtk.Frame(label="History & Data")
-        history_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        history_box.set_margin_start(15)
-        history_box.set_margin_end(15)
-        history_box.set_margin_top(10)
-        history_box.set_margin_bottom(15)
+        history_box = self.add_section(vbox, "History & Data")
 
         self.uptime_tracking_check = Gtk.CheckButton(label="Enable uptime tracking")
         history_box.pack_start(self.uptime_tracking_check, False, False, 0)
 
         # Retention period
-        retention_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        retention_label = Gtk.Label(label="Data retention (days):")
-        retention_label.set_halign(Gtk.Align.START)
-
-        self.retention_spin = Gtk.SpinButton.new_with_range(1, 365, 1)
-
-        retention_hbox.pack_start(retention_label, False, False, 0)
-        retention_hbox.pack_end(self.retention_spin, False, False, 0)
-        history_box.pack_start(retention_hbox, False, False, 0)
-
-        history_frame.add(history_box)
-        vbox.pack_start(history_frame, False, False, 0)
-
-        self.notebook.append_page(vbox, Gtk.Label(label="Monitoring"))
+        self.retention_spin = self.labeled_row(
+            history_box,
+            "Data retention (days):",
+            Gtk.SpinButton.new_with_range(1, 365, 1),
+        )
 
-    def create_notifications_tab(self):
+    def create_notifications_tab(self, vbox):
         """Create notifications settings tab"""
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        vbox.set_margin_start(20)
-        vbox.set_margin_end(20)
-        vbox.set_margin_top(20)
-        vbox.set_margin_bottom(20)
+        vbox.set_spacing(15)
 
         # Desktop notifications
-        desktop_frame = Gtk.Frame(label="Desktop Notifications")
-        desktop_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        desktop_box.set_margin_start(15)
-        desktop_box.set_margin_end(15)
-        desktop_box.set_margin_top(10)
-        desktop_box.set_margin_bottom(15)
+        desktop_box = self.add_section(vbox, "Desktop Notifications")
 
         self.desktop_notifications_check = Gtk.CheckButton(
             label="Enable desktop notifications"
@@ -266,74 +285,45 @@ class SettingsDialog(Gtk.Dialog):
         desktop_box.pack_start(self.sound_alerts_check, False, False, 0)
 
         # Notification timeout
-        timeout_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        timeout_label = Gtk.Label(label="Notification timeout (ms):")
-        timeout_label.set_halign(Gtk.Align.START)
-
-        self.notification_timeout_spin = Gtk.SpinButton.new_with_range(1000, 10000, 500)
-
-        timeout_hbox.pack_start(timeout_label, False, False, 0)
-        timeout_hbox.pack_end(self.notification_timeout_spin, False, False, 0)
-        desktop_box.pack_start(timeout_hbox, False, False, 0)
-
-        desktop_frame.add(desktop_box)
-        vbox.pack_start(desktop_frame, False, False, 0)
+        self.notification_timeout_spin = self.labeled_row(
+            desktop_box,
+            "Notification timeout (ms):",
+            Gtk.SpinButton.new_with_range(1000, 10000, 500),
+        )
 
         # Webhook notifications
-        webhook_frame = Gtk.Frame(label="Webhook Integration")
-        webhook_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        webhook_box.set_margin_start(15)
-        webhook_box.set_margin_end(15)
-        webhook_box.set_margin_top(10)
-        webhook_box.set_margin_bottom(15)
-
-        webhook_url_hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        webhook_url_label = Gtk.Label(label="Webhook URL:")
-        webhook_url_label.set_halign(Gtk.Align.START)
+        webhook_box = self.add_section(vbox, "Webhook Integration")
 
         self.webhook_url_entry = Gtk.Entry()
         self.webhook_url_entry.set_placeholder_text(
             "https://hooks.slack.com/... or Discord webhook URL"
         )
         self.webhook_url_entry.set_hexpand(True)
-
-        webhook_url_hbox.pack_start(webhook_url_label, False, False, 0)
-        webhook_url_hbox.pack_start(self.webhook_url_entry, True, True, 0)
-        webhook_box.pack_start(webhook_url_hbox, False, False, 0)
+        self.labeled_row(
+            webhook_box, "Webhook URL:", self.webhook_url_entry, expand=True
+        )
 
         # Test webhook button
         test_webhook_btn = Gtk.Button(label="Test Webhook")
         test_webhook_btn.connect("clicked", self.on_test_webhook)
         webhook_box.pack_start(test_webhook_btn, False, False, 0)
 
-        webhook_frame.add(webhook_box)
-        vbox.pack_start(webhook_frame, False, False, 0)
-
-        self.notebook.append_page(vbox, Gtk.Label(label="Notifications"))
-
-    def create_servers_tab(self):
+    def create_servers_tab(self, vbox):
         """Create servers management tab"""
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        vbox.set_margin_start(20)
-        vbox.set_margin_end(20)
-        vbox.set_margin_top(20)
-        vbox.set_margin_bottom(20)
+        vbox.set_spacing(10)
 
         # Toolbar
         toolbar_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
 
-        add_btn = Gtk.Button(label="Add Server")
-        add_btn.connect("clicked", self.on_add_server)
-
-        edit_btn = Gtk.Button(label="Edit Server")
-        edit_btn.connect("clicked", self.on_edit_server)
-
-        remove_btn = Gtk.Button(label="Remove Server")
-        remove_btn.connect("clicked", self.on_remove_server)
-
-        toolbar_box.pack_start(add_btn, False, False, 0)
-        toolbar_box.pack_start(edit_btn, False, False, 0)
-        toolbar_box.pack_start(remove_btn, False, False, 0)
+        buttons = [
+            ("Add Server", self.on_add_server),
+            ("Edit Server", self.on_edit_server),
+            ("Remove Server", self.on_remove_server),
+        ]
+        for label, handler in buttons:
+            button = Gtk.Button(label=label)
+            button.connect("clicked", handler)
+            toolbar_box.pack_start(button, False, False, 0)
 
         vbox.pack_start(toolbar_box, False, False, 0)
 
@@ -343,9 +333,9 @@ class SettingsDialog(Gtk.Dialog):
         scrolled.set_min_content_height(300)
 
         # Create list store
-        self.servers_store = Gtk.ListStore(
-            str, str, str, str, int, bool
-        )  # name, host, type, check_type, interval, enabled
+        # name, host, type, check_type, interval, enabled, and the server's
+        # index in settings_manager.servers (rows move when sorted)
+        self.servers_store = Gtk.ListStore(str, str, str, str, int, bool, int)
 
         # Create tree view
         self.servers_tree = Gtk.TreeView(model=self.servers_store)
@@ -357,11 +347,11 @@ class SettingsDialog(Gtk.Dialog):
             ("Type", 2),
             ("Check Type", 3),
             ("Interval", 4),
-            ("Enabled", 5),
+            ("Enabled", ENABLED_COLUMN),
         ]
 
         for title, col_id in columns:
-            if col_id == 5:  # Enabled column - checkbox
+            if col_id == ENABLED_COLUMN:  # checkbox
                 renderer = Gtk.CellRendererToggle()
                 renderer.connect("toggled", self.on_server_enabled_toggled)
                 column = Gtk.TreeViewColumn(title, renderer, active=col_id)
@@ -376,15 +366,15 @@ class SettingsDialog(Gtk.Dialog):
         scrolled.add(self.servers_tree)
         vbox.pack_start(scrolled, True, True, 0)
 
-        self.notebook.append_page(vbox, Gtk.Label(label="Servers"))
-
     def load_settings(self):
-        """Load current settings into the dialog"""
+        """Load current settings into the tabs built so far"""
+        for load, _ in self._built_tabs.values():
+            load()
+
+    def load_general_settings(self):
+        """Load appearance and window settings into the General tab"""
         ui_settings = self.settings_manager.ui_settings
-        monitoring_settings = self.settings_manager.monitoring_settings
-        notification_settings = self.settings_manager.notification_settings
 
-        # General tab
         self.theme_combo.set_active_id(ui_settings.theme.value)
         self.opacity_scale.set_value(ui_settings.opacity)
         self.animation_check.set_active(ui_settings.animation_enabled)
@@ -392,7 +382,10 @@ class SettingsDialog(Gtk.Dialog):
         self.minimize_to_tray_check.set_active(ui_settings.minimize_to_tray)
         self.auto_hide_check.set_active(ui_settings.auto_hide)
 
-        # Monitoring tab
+    def load_monitoring_settings(self):
+        """Load monitoring settings into the Monitoring tab"""
+        monitoring_settings = self.settings_manager.monitoring_settings
+
         self.interval_spin.set_value(monitoring_settings.global_check_interval)
         self.parallel_checks.set_active(monitoring_settings.parallel_checks)
         self.concurrent_spin.set_value(monitoring_settings.max_concurrent_checks)
@@ -403,7 +396,10 @@ class SettingsDialog(Gtk.Dialog):
         )
         self.retention_spin.set_value(monitoring_settings.history_retention_days)
 
-        # Notifications tab
+    def load_notification_settings(self):
+        """Load notification settings into the Notifications tab"""
+        notification_settings = self.settings_manager.notification_settings
+
         self.desktop_notifications_check.set_active(
             notification_settings.desktop_notifications
         )
@@ -421,36 +417,45 @@ class SettingsDialog(Gtk.Dialog):
         if notification_settings.webhook_url:
             self.webhook_url_entry.set_text(notification_settings.webhook_url)
 
-        # Servers tab
-        self.load_servers_list()
-
     def load_servers_list(self):
         """Load servers into the list"""
-        self.servers_store.clear()
-
-        for server in self.settings_manager.servers:
-            self.servers_store.append(
+        # Detach the model while it is refilled so the tree view is not
+        # notified and redrawn once per row
+        store = self.servers_store
+        self.servers_tree.set_model(None)
+        store.clear()
+
+        append = store.append
+        for index, server in enumerate(self.settings_manager.servers):
+            append(
                 [
                     server.name,
                     server.host,
                     server.type,
-                    (
-                        server.check_type.value
-                        if hasattr(server.check_type, "value")
-                        else str(server.check_type)
-                    ),
+                    server.check_type.value,
                     server.check_interval,
                     server.enabled,
+                    index,
                 ]
             )
 
+        self.servers_tree.set_model(store)
+
     def save_settings(self):
-        """Save settings from the dialog"""
+        """Save settings from the dialog; tabs never shown left their
+        settings untouched"""
+        for _, save in self._built_tabs.values():
+            if save is not None:
+                save()
+
+        # Save to disk
+        self.settings_manager.save_settings()
+        self.flush_servers_save()
+
+    def save_general_settings(self):
+        """Read the General tab back into the UI settings"""
         ui_settings = self.settings_manager.ui_settings
-        monitoring_settings = self.settings_manager.monitoring_settings
-        notification_settings = self.settings_manager.notification_settings
 
-        # General tab
         ui_settings.theme = ThemeType(self.theme_combo.get_active_id())
         ui_settings.opacity = self.opacity_scale.get_value()
         ui_settings.animation_enabled = self.animation_check.get_active()
@@ -458,7 +463,10 @@ class SettingsDialog(Gtk.Dialog):
         ui_settings.minimize_to_tray = self.minimize_to_tray_check.get_active()
         ui_settings.auto_hide = self.auto_hide_check.get_active()
 
-        # Monitoring tab
+    def save_monitoring_settings(self):
+        """Read the Monitoring tab back into the monitoring settings"""
+        monitoring_settings = self.settings_manager.monitoring_settings
+
         monitoring_settings.global_check_interval = int(self.interval_spin.get_value())
         monitoring_settings.parallel_checks = self.parallel_checks.get_active()
         monitoring_settings.max_concurrent_checks = int(
@@ -477,7 +485,10 @@ class SettingsDialog(Gtk.Dialog):
             self.retention_spin.get_value()
         )
 
-        # Notifications tab
+    def save_notification_settings(self):
+        """Read the Notifications tab back into the notification settings"""
+        notification_settings = self.settings_manager.notification_settings
+
         notification_settings.desktop_notifications = (
             self.desktop_notifications_check.get_active()
         )
@@ -495,9 +506,6 @@ class SettingsDialog(Gtk.Dialog):
         webhook_url = self.webhook_url_entry.get_text().strip()
         notification_settings.webhook_url = webhook_url if webhook_url else None
 
-        # Save to disk
-        self.settings_manager.save_settings()
-
     def on_test_webhook(self, button):
         """Test webhook notification"""
         webhook_url = self.webhook_url_entry.get_text().strip()
@@ -506,20 +514,31 @@ class SettingsDialog(Gtk.Dialog):
             return
 
         # Create temporary notification settings
-        from .settings import NotificationSettings
         from .notifications import NotificationManager
 
         temp_settings = NotificationSettings(webhook_url=webhook_url)
         notifier = NotificationManager(temp_settings)
 
-        # Send test notification
-        notifier.send_webhook_notification(
-            "Test Server",
-            "unknown",
-            "operational",
-            123,
-            "Test webhook notification from settings",
-        )
+        # Send test notification inline, then release the manager's threads
+        # and HTTP session
+        try:
+            status_code = notifier.send_webhook_notification(
+                "Test Server",
+                "unknown",
+                "operational",
+                123,
+                "Test webhook notification from settings",
+                _sync=True,
+            )
+        finally:
+            notifier.close()
+
+        if status_code is None or status_code >= 400:
+            detail = f"HTTP {status_code}" if status_code else "no response"
+            self.show_message(
+                "Test Failed", f"The webhook could not be delivered ({detail})."
+            )
+            return
 
         self.show_message(
             "Test Sent",
@@ -548,9 +567,7 @@ class SettingsDialog(Gtk.Dialog):
             self.show_message("No Selection", "Please select a server to edit.")
             return
 
-        # Get server index
-        path = model.get_path(treeiter)
-        server_index = path.get_indices()[0]
+        server_index = model.get_value(treeiter, INDEX_COLUMN)
         server = self.settings_manager.servers[server_index]
 
         dialog = ServerEditDialog(self, server)
@@ -559,7 +576,7 @@ class SettingsDialog(Gtk.Dialog):
 
         if response == Gtk.ResponseType.OK:
             new_server = dialog.get_server_config()
-            self.settings_manager.update_server(server.name, new_server)
+            self.settings_manager.update_server_by_index(server_index, new_server)
             self.load_servers_list()
 
         dialog.destroy()
@@ -574,52 +591,98 @@ class SettingsDialog(Gtk.Dialog):
             return
 
         server_name = model.get_value(treeiter, 0)
+        server_index = model.get_value(treeiter, INDEX_COLUMN)
 
         # Confirm removal
-        dialog = Gtk.MessageDialog(
-            transient_for=self,
-            flags=0,
-            message_type=Gtk.MessageType.QUESTION,
-            buttons=Gtk.ButtonsType.YES_NO,
-            text=f"Remove server '{server_name}'?",
+        response = self.run_message_dialog(
+            Gtk.MessageType.QUESTION,
+            Gtk.ButtonsType.YES_NO,
+            f"Remove server '{server_name}'?",
+            "This action cannot be undone.",
         )
-        dialog.format_secondary_text("This action cannot be undone.")
-
-        response = dialog.run()
-        dialog.destroy()
 
         if response == Gtk.ResponseType.YES:
-            self.settings_manager.remove_server(server_name)
+            self.settings_manager.remove_server_by_index(server_index)
             self.load_servers_list()
 
     def on_server_enabled_toggled(self, renderer, path):
         """Toggle server enabled state"""
-        treeiter = self.servers_store.get_iter(path)
-        current_value = self.servers_store.get_value(treeiter, 5)
+        store = self.servers_store
+        settings_manager = self.settings_manager
+
+        treeiter = store.get_iter(path)
+        enabled = not store.get_value(treeiter, ENABLED_COLUMN)
 
         # Update store
-        self.servers_store.set_value(treeiter, 5, not current_value)
+        store.set_value(treeiter, ENABLED_COLUMN, enabled)
+
+        # Update server config; the write is deferred so a burst of toggles
+        # is saved once
+        settings_manager.servers[store.get_value(treeiter, INDEX_COLUMN)].enabled = (
+            enabled
+        )
+        if self._save_servers_id is None:
+            self._save_servers_id = GLib.timeout_add(250, self.on_save_servers_timeout)
 
-        # Update server config
-        server_index = int(path)
-        self.settings_manager.servers[server_index].enabled = not current_value
+    def on_save_servers_timeout(self):
+        """Write the servers changed by enabled toggles"""
+        self._save_servers_id = None
         self.settings_manager.save_servers()
+        return False
+
+    def flush_servers_save(self):
+        """Write a deferred servers save now rather than on its timer"""
+        if self._save_servers_id is not None:
+            GLib.source_remove(self._save_servers_id)
+            self.on_save_servers_timeout()
+
+    def on_destroy(self, widget):
+        """Don't lose enabled toggles when the dialog closes"""
+        self.flush_servers_save()
 
     def show_message(self, title, message):
         """Show message dialog"""
-        dialog = Gtk.MessageDialog(
-            transient_for=self,
-            flags=0,
-            message_type=Gtk.MessageType.INFO,
-            buttons=Gtk.ButtonsType.OK,
-            text=title,
+        self.run_message_dialog(
+            Gtk.MessageType.INFO, Gtk.ButtonsType.OK, title, message
         )
-        dialog.format_secondary_text(message)
-        dialog.run()
-        dialog.destroy()
+
+    def run_message_dialog(self, message_type, buttons, text, secondary_text):
+        """Show a modal message and return the response; dialogs are created
+        once per kind and hidden rather than destroyed between uses"""
+        key = (message_type, buttons)
+        dialog = self._message_dialogs.get(key)
+        if dialog is None:
+            # Destroyed along with the settings dialog
+            dialog = Gtk.MessageDialog(
+                transient_for=self,
+                flags=0,
+                message_type=message_type,
+                buttons=buttons,
+                destroy_with_parent=True,
+            )
+            self._message_dialogs[key] = dialog
+
+        dialog.set_property("text", text)
+        dialog.format_secondary_text(secondary_text)
+        response = dialog.run()
+        dialog.hide()
+        return response
 
 
 class ServerEditDialog(Gtk.Dialog):
+    # Widgets of server_edit.ui kept as attributes of the dialog
+    FORM_WIDGETS = (
+        "name_entry",
+        "host_entry",
+        "port_spin",
+        "check_type_combo",
+        "interval_spin",
+        "group_entry",
+        "icon_entry",
+        "enabled_check",
+    )
+    _form_ui = None  # server_edit.ui, read on first use
+
     def __init__(self, parent, server_config):
         title = "Edit Server" if server_config else "Add Server"
         super().__init__(title=title, transient_for=parent)
@@ -649,64 +712,14 @@ class ServerEditDialog(Gtk.Dialog):
         content_area.set_margin_top(10)
         content_area.set_margin_bottom(10)
 
-        # Create form
-        grid = Gtk.Grid()
-        grid.set_row_spacing(10)
-        grid.set_column_spacing(10)
-
-        # Name
-        grid.attach(Gtk.Label(label="Name:", halign=Gtk.Align.START), 0, 0, 1, 1)
-        self.name_entry = Gtk.Entry()
-        grid.attach(self.name_entry, 1, 0, 1, 1)
-
-        # Host
-        grid.attach(Gtk.Label(label="Host:", halign=Gtk.Align.START), 0, 1, 1, 1)
-        self.host_entry = Gtk.Entry()
-        self.host_entry.set_placeholder_text("example.com or https://api.example.com")
-        grid.attach(self.host_entry, 1, 1, 1, 1)
-
-        # Port
-        grid.attach(Gtk.Label(label="Port:", halign=Gtk.Align.START), 0, 2, 1, 1)
-        self.port_spin = Gtk.SpinButton.new_with_range(1, 65535, 1)
-        self.port_spin.set_value(80)
-        grid.attach(self.port_spin, 1, 2, 1, 1)
-
-        # Check type
-        grid.attach(Gtk.Label(label="Check Type:", halign=Gtk.Align.START), 0, 3, 1, 1)
-        self.check_type_combo = Gtk.ComboBoxText()
-        self.check_type_combo.append("http", "HTTP/HTTPS")
-        self.check_type_combo.append("ping", "Ping")
-        self.check_type_combo.append("tcp", "TCP Socket")
-        self.check_type_combo.append("custom", "Custom Command")
-        self.check_type_combo.set_active(0)
-        grid.attach(self.check_type_combo, 1, 3, 1, 1)
-
-        # Check interval
-        grid.attach(
-            Gtk.Label(label="Check Interval (s):", halign=Gtk.Align.START), 0, 4, 1, 1
-        )
-        self.interval_spin = Gtk.SpinButton.new_with_range(5, 300, 5)
-        self.interval_spin.set_value(15)
-        grid.attach(self.interval_spin, 1, 4, 1, 1)
-
-        # Group
-        grid.attach(Gtk.Label(label="Group:", halign=Gtk.Align.START), 0, 5, 1, 1)
-        self.group_entry = Gtk.Entry()
-        self.group_entry.set_text("Default")
-        grid.attach(self.group_entry, 1, 5, 1, 1)
+        # The form is laid out in server_edit.ui and built by GtkBuilder
+        if ServerEditDialog._form_ui is None:
+            ServerEditDialog._form_ui = SERVER_EDIT_UI.read_text(encoding="utf-8")
+        builder = Gtk.Builder.new_from_string(self._form_ui, -1)
+        for name in self.FORM_WIDGETS:
+            setattr(self, name, builder.get_object(name))
 
-        # Icon
-        grid.attach(Gtk.Label(label="Icon:", halign=Gtk.Align.START), 0, 6, 1, 1)
-        self.icon_entry = Gtk.Entry()
-        self.icon_entry.set_placeholder_text("🖥️ (emoji or leave empty)")
-        grid.attach(self.icon_entry, 1, 6, 1, 1)
-
-        # Enabled
-        self.enabled_check = Gtk.CheckButton(label="Enabled")
-        self.enabled_check.set_active(True)
-        grid.attach(self.enabled_check, 0, 7, 2, 1)
-
-        content_area.pack_start(grid, True, True, 0)
+        content_area.pack_start(builder.get_object("form_grid"), True, True, 0)
 
     def load_server_config(self):
         """Load server configuration into form"""
@@ -719,17 +732,12 @@ class ServerEditDialog(Gtk.Dialog):
         if self.server_config.port:
             self.port_spin.set_value(self.server_config.port)
 
-        check_type = (
-            self.server_config.check_type.value
-            if hasattr(self.server_config.check_type, "value")
-            else str(self.server_config.check_type)
-        )
-        self.check_type_combo.set_active_id(check_type)
+        self.check_type_combo.set_active_id(self.server_config.check_type.value)
 
         self.interval_spin.set_value(self.server_config.check_interval)
         self.group_entry.set_text(self.server_config.group)
 
-        if hasattr(self.server_config, "icon") and self.server_config.icon:
+        if self.server_config.icon:
             self.icon_entry.set_text(self.server_config.icon)
 
         self.enabled_check.set_active(self.server_config.enabled)
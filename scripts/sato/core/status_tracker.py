@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from collections import defaultdict, deque
+from itertools import islice
 
 
 @dataclass
@@ -53,6 +54,8 @@ class StatusTracker:
         self.recent_events: deque = deque(
             maxlen=1000
         )  # Keep last 1000 events in memory
+        # Per-server view of recent_events, oldest first
+        self._events_by_server: Dict[str, deque] = defaultdict(deque)
         self.response_times: Dict[str, deque] = defaultdict(
             lambda: deque(maxlen=100)
         )  # Last 100 response times per server
@@ -67,6 +70,31 @@ class StatusTracker:
         self, server_name: str, status: str, response_time: int, message: str = ""
     ):
         """Record a status check result"""
+        # Thread-safe operations
+        should_save = False
+        with self._lock:
+            self._append_event(server_name, status, response_time, message)
+
+            # Check if we should save (but don't save while holding the lock)
+            should_save = len(self.recent_events) % 10 == 0
+
+        # Save to disk periodically (outside the lock to avoid deadlock)
+        if should_save:
+            self.save_history()
+
+    def record_status_bulk(self, events: List[Tuple[str, str, int, str]]):
+        """Record several (server_name, status, response_time, message) results
+        and save the history once"""
+        with self._lock:
+            for server_name, status, response_time, message in events:
+                self._append_event(server_name, status, response_time, message)
+
+        self.save_history()
+
+    def _append_event(
+        self, server_name: str, status: str, response_time: int, message: str
+    ):
+        """Add a status event to memory (caller must hold the lock)"""
         timestamp = time.time()
 
         event = StatusEvent(
@@ -77,25 +105,33 @@ class StatusTracker:
             message=message,
         )
 
-        # Thread-safe operations
-        should_save = False
-        with self._lock:
-            # Add to recent events
-            self.recent_events.append(event)
+        # Add to recent events
+        self._add_recent_event(event)
 
-            # Update response times
-            if response_time > 0:
-                self.response_times[server_name].append((timestamp, response_time))
+        # Update response times
+        if response_time > 0:
+            self.response_times[server_name].append((timestamp, response_time))
 
-            # Update uptime stats
-            self.update_uptime_stats(server_name, status, response_time, timestamp)
+        # Update uptime stats
+        self.update_uptime_stats(server_name, status, response_time, timestamp)
 
-            # Check if we should save (but don't save while holding the lock)
-            should_save = len(self.recent_events) % 10 == 0
+    def _add_recent_event(self, event: StatusEvent):
+        """Append to recent_events and the per-server index, evicting the
+        oldest event from both once the window is full"""
+        if len(self.recent_events) == self.recent_events.maxlen:
+            evicted = self.recent_events[0]
+            server_events = self._events_by_server.get(evicted.server_name)
+            if server_events and server_events[0] is evicted:
+                server_events.popleft()
 
-        # Save to disk periodically (outside the lock to avoid deadlock)
-        if should_save:
-            self.save_history()
+        self.recent_events.append(event)
+        self._events_by_server[event.server_name].append(event)
+
+    def _rebuild_server_index(self):
+        """Rebuild the per-server index from recent_events"""
+        self._events_by_server = defaultdict(deque)
+        for event in self.recent_events:
+            self._events_by_server[event.server_name].append(event)
 
     def update_uptime_stats(
         self, server_name: str, status: str, response_time: int, timestamp: float
@@ -139,14 +175,14 @@ class StatusTracker:
         self, server_name: Optional[str] = None, limit: int = 50
     ) -> List[StatusEvent]:
         """Get recent status events, optionally filtered by server"""
-        events = list(self.recent_events)
-
-        if server_name:
-            events = [e for e in events if e.server_name == server_name]
+        with self._lock:
+            if server_name:
+                events = self._events_by_server.get(server_name, ())
+            else:
+                events = self.recent_events
 
-        # Sort by timestamp (newest first) and limit
-        events.sort(key=lambda x: x.timestamp, reverse=True)
-        return events[:limit]
+            # Events are stored oldest first, so walk backwards for newest first
+            return list(islice(reversed(events), limit))
 
     def get_response_time_history(
         self, server_name: str, hours: int = 24
@@ -190,17 +226,18 @@ class StatusTracker:
         """Get status change events for a server"""
         cutoff_time = time.time() - (hours * 3600)
 
-        events = [
-            e
-            for e in self.recent_events
-            if e.server_name == server_name and e.timestamp >= cutoff_time
-        ]
+        with self._lock:
+            events = [
+                e
+                for e in self._events_by_server.get(server_name, ())
+                if e.timestamp >= cutoff_time
+            ]
 
         # Filter to only status changes
         status_changes = []
         last_status = None
 
-        for event in sorted(events, key=lambda x: x.timestamp):
+        for event in events:
             if event.status != last_status:
                 status_changes.append(event)
                 last_status = event.status
@@ -245,7 +282,7 @@ class StatusTracker:
                     if "events" in data:
                         for event_data in data["events"]:
                             event = StatusEvent(**event_data)
-                            self.recent_events.append(event)
+                            self._add_recent_event(event)
 
                     # Load uptime stats
                     if "uptime_stats" in data:
@@ -300,6 +337,7 @@ class StatusTracker:
                 events_to_keep.append(event)
 
         self.recent_events = deque(events_to_keep, maxlen=1000)
+        self._rebuild_server_index()
 
         # Filter response times (thread-safe)
         for server_name in list(self.response_times.keys()):  # Create a copy of keys
@@ -804,10 +804,6 @@ class SatoMonitoringSystem(Gtk.Window):
                 if not hasattr(server, "timeout") or server.timeout > 5:
                     server.timeout = 3  # Maximum 3 seconds timeout for faster response
 
-                # Initialize performance tracking
-                if not hasattr(server, "_consecutive_success"):
-                    server._consecutive_success = 0
-
         # Start batch monitoring instead of individual threads
         self.start_batch_monitoring()
 
@@ -841,33 +837,14 @@ class SatoMonitoringSystem(Gtk.Window):
                         for server_index, result in docker_results.items():
                             self.process_check_result(server_index, result)
 
-                    # Process regular services with independent threads for immediate updates
-                    for server_index, server in regular_services:
-
-                        def create_check_thread(srv_idx, srv):
-                            def check_and_update():
-                                try:
-                                    result = self.health_checker.check_server(
-                                        srv, timeout=4
-                                    )
-                                    # Process result immediately when ready
-                                    self.process_check_result(srv_idx, result)
-                                except Exception as e:
-                                    from core.health_checker import CheckResult
-
-                                    error_result = CheckResult(
-                                        False, 0, f"Check failed: {str(e)}"
-                                    )
-                                    self.process_check_result(srv_idx, error_result)
-
-                            # Start independent thread - results appear as soon as ready
-                            thread = threading.Thread(
-                                target=check_and_update, daemon=True
-                            )
-                            thread.start()
-                            return thread
-
-                        create_check_thread(server_index, server)
+                    # Check regular services concurrently; each result is
+                    # processed as soon as it is ready
+                    if regular_services:
+                        self.health_checker.check_servers(
+                            regular_services,
+                            timeout=4,
+                            on_result=self.process_check_result,
+                        )
 
                 except Exception as e:
                     print(f"❌ Error in batch monitoring: {e}")
@@ -900,9 +877,7 @@ class SatoMonitoringSystem(Gtk.Window):
 
             # Track consecutive successes for optimization
             if result.is_healthy:
-                server._consecutive_success = (
-                    getattr(server, "_consecutive_success", 0) + 1
-                )
+                server._consecutive_success += 1
             else:
                 server._consecutive_success = 0
 
@@ -2040,6 +2015,11 @@ class SatoMonitoringSystem(Gtk.Window):
         # Cleanup performance optimizer
         if hasattr(self, "performance_optimizer"):
             self.performance_optimizer.shutdown()
+        if hasattr(self, "fast_health_checker"):
+            self.fast_health_checker.close()
+
+        # Deliver batched alerts and stop notification workers
+        self.notification_manager.close()
 
         # Save final status
         self.status_tracker.save_history()
@@ -2244,6 +2224,9 @@ class SatoMonitoringSystem(Gtk.Window):
         """Apply settings changes that require UI updates"""
         ui_settings = self.settings_manager.ui_settings
 
+        # Server hosts/endpoints may have changed
+        self.health_checker.clear_caches()
+
         # Update theme
         new_theme = ui_settings.theme == ThemeType.LIGHT
         if new_theme != self.is_light_theme:
@@ -2267,7 +2250,9 @@ class SatoMonitoringSystem(Gtk.Window):
         self.set_keep_above(ui_settings.always_on_top)
 
         # Update notification manager settings
-        self.notification_manager.settings = self.settings_manager.notification_settings
+        self.notification_manager.reconfigure(
+            self.settings_manager.notification_settings
+        )
 
         # Only rebuild services if servers actually changed (check if needed)
         # For now, we'll skip this to preserve monitoring state
@@ -2565,7 +2550,10 @@ def main():
 
         settings = NotificationSettings(desktop_notifications=True)
         notifier = NotificationManager(settings)
-        notifier.test_notifications()
+        try:
+            notifier.test_notifications()
+        finally:
+            notifier.close()
         return
 
     try:
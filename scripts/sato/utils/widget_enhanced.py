@@ -901,7 +901,10 @@ def main():
 
         settings = NotificationSettings(desktop_notifications=True)
         notifier = NotificationManager(settings)
-        notifier.test_notifications()
+        try:
+            notifier.test_notifications()
+        finally:
+            notifier.close()
         return
 
     try: